@@ -1,10 +1,13 @@
-from typing import Generator
+from typing import AsyncGenerator
 from datetime import datetime
+import hashlib
+import time
 
+from cachetools import TLRUCache
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
 from app.db.session import get_session
@@ -17,34 +20,58 @@ oauth2_scheme = OAuth2PasswordBearer(
     auto_error=not settings.disable_auth  # 禁用认证时不自动抛出401错误
 )
 
+_TOKEN_CACHE_TTL_SECONDS = 30
 
-def get_db() -> Generator[Session, None, None]:
-    yield from get_session()
+# token digest -> (user, exp). Entries live for at most 30s and never outlive the token itself,
+# so bursts of authenticated requests skip both the HMAC verify and the user-by-email query.
+_token_cache: TLRUCache = TLRUCache(
+    maxsize=10_000,
+    ttu=lambda _key, value, now: min(now + _TOKEN_CACHE_TTL_SECONDS, value[1]),
+    timer=time.time,
+)
+
+# 禁用认证时使用的模拟超级用户，只在导入时构建一次
+_MOCK_NOW = datetime.utcnow()
+_MOCK_USER: User | None = (
+    User(
+        id=1,
+        email="dev@localhost",
+        full_name="开发模式用户",
+        is_active=True,
+        is_superuser=True,
+        hashed_password="not-used",
+        created_at=_MOCK_NOW,
+        updated_at=_MOCK_NOW,
+    )
+    if settings.disable_auth
+    else None
+)
 
 
-def get_current_user(
-    token: str | None = Depends(oauth2_scheme), db: Session = Depends(get_db)
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async for session in get_session():
+        yield session
+
+
+async def get_current_user(
+    token: str | None = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
 ) -> User:
     # 如果禁用认证，返回模拟管理员用户
-    if settings.disable_auth:
-        # 返回一个包含所有必需字段的模拟超级用户对象
-        now = datetime.utcnow()
-        return User(
-            id=1,
-            email="dev@localhost",
-            full_name="开发模式用户",
-            is_active=True,
-            is_superuser=True,
-            hashed_password="not-used",
-            created_at=now,
-            updated_at=now,
-        )
-    
+    if _MOCK_USER is not None:
+        return _MOCK_USER
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if token is None:
+        raise credentials_exception
+    cache_key = hashlib.sha256(token.encode()).digest()[:16]
+    cached = _token_cache.get(cache_key)
+    if cached is not None:
+        return cached[0]
+
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
         token_data = TokenPayload(**payload)
@@ -52,13 +79,26 @@ def get_current_user(
         raise credentials_exception from exc
     if token_data.sub is None:
         raise credentials_exception
-    user = get_by_email(db, token_data.sub)
+    user = await get_by_email(db, token_data.sub)
     if user is None:
         raise credentials_exception
+    if token_data.exp is not None:
+        # Routes only read the user, so the detached instance is safe to hand out again.
+        _token_cache[cache_key] = (user, token_data.exp)
     return user
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+
+async def require_active_user(current_user: User = Depends(get_current_user)) -> None:
+    """Route-level guard for handlers that need an active user but never read it."""
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+
+
+# Route dependencies for handlers that only need the caller to be an active user
+protected = [Depends(require_active_user)]
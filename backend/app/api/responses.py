@@ -0,0 +1,15 @@
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+class ModelJSONResponse(Response):
+    """Encode an already-built response schema in one pass with pydantic-core.
+
+    Skips both FastAPI's response_model re-validation and the dict round-trip that
+    ``model_dump()`` + a generic JSON encoder would need.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.model_dump_json().encode("utf-8")
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr
-from sqlalchemy import func, select
-from sqlmodel import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api import deps
 from app.core.security import create_access_token, get_password_hash
@@ -14,10 +15,10 @@ router = APIRouter()
 
 
 @router.post("/token", response_model=Token)
-def login_access_token(
-    db: Session = Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()
+async def login_access_token(
+    db: AsyncSession = Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Token:
-    user = crud_user.authenticate(db, email=form_data.username, password=form_data.password)
+    user = await crud_user.authenticate(db, email=form_data.username, password=form_data.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect credentials")
     token = create_access_token(subject=user.email)
@@ -31,23 +32,22 @@ class BootstrapRequest(BaseModel):
 
 
 @router.post("/bootstrap", response_model=UserRead)
-def bootstrap_admin(data: BootstrapRequest, db: Session = Depends(deps.get_db)) -> User:
-    statement = select(func.count(User.id))
-    existing = db.exec(statement).one()
-    if existing and existing[0] > 0:
+async def bootstrap_admin(data: BootstrapRequest, db: AsyncSession = Depends(deps.get_db)) -> User:
+    statement = select(User.id).limit(1)
+    if (await db.exec(statement)).first() is not None:
         raise HTTPException(status_code=400, detail="Admin already initialized")
     user = User(
         email=data.email,
-        hashed_password=get_password_hash(data.password),
+        hashed_password=await run_in_threadpool(get_password_hash, data.password),
         full_name=data.full_name,
         is_superuser=True,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
 @router.get("/me", response_model=UserRead)
-def read_current_user(current_user: User = Depends(deps.get_current_active_user)) -> User:
+async def read_current_user(current_user: User = Depends(deps.get_current_active_user)) -> User:
     return current_user
@@ -1,40 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api import deps
 from app.crud import catalog as catalog_crud
-from app.models.user import User
-from app.schemas.site import CategoryRead, TagCreate, TagRead
+from app.schemas.site import (
+    CATEGORY_LIST_ADAPTER,
+    TAG_LIST_ADAPTER,
+    CategoryRead,
+    TagCreate,
+    TagRead,
+)
+from app.services import taxonomy
 
 router = APIRouter()
 
 
 @router.get("/categories", response_model=list[CategoryRead])
-def list_categories(db: Session = Depends(deps.get_db)) -> list[CategoryRead]:
-    return catalog_crud.list_categories(db)
+async def list_categories(db: AsyncSession = Depends(deps.get_db)) -> Response:
+    categories = CATEGORY_LIST_ADAPTER.validate_python(
+        await catalog_crud.list_categories(db), from_attributes=True
+    )
+    return Response(CATEGORY_LIST_ADAPTER.dump_json(categories), media_type="application/json")
 
 
 @router.get("/tags", response_model=list[TagRead])
-def list_tags(db: Session = Depends(deps.get_db)) -> list[TagRead]:
-    return catalog_crud.list_tags(db)
-
-
-@router.post("/tags", response_model=TagRead, status_code=status.HTTP_201_CREATED)
-def create_tag(
+async def list_tags(db: AsyncSession = Depends(deps.get_db)) -> Response:
+    tags = TAG_LIST_ADAPTER.validate_python(await catalog_crud.list_tags(db), from_attributes=True)
+    return Response(TAG_LIST_ADAPTER.dump_json(tags), media_type="application/json")
+
+
+@router.post(
+    "/tags",
+    response_model=TagRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=deps.protected,
+)
+async def create_tag(
     tag: TagCreate,
-    db: Session = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_db),
 ) -> TagRead:
-    result = catalog_crud.upsert_tag(db, name=tag.name, color=tag.color)
+    result = await catalog_crud.upsert_tag(db, name=tag.name, color=tag.color)
+    taxonomy.invalidate()
     return TagRead(id=result.id, name=result.name, color=result.color)
 
 
-@router.delete("/tags/{tag_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_tag(
+@router.delete("/tags/{tag_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=deps.protected)
+async def delete_tag(
     tag_id: int,
-    db: Session = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_db),
 ) -> None:
-    deleted = catalog_crud.delete_tag(db, tag_id)
+    deleted = await catalog_crud.delete_tag(db, tag_id)
+    taxonomy.invalidate()
     if not deleted:
         raise HTTPException(status_code=404, detail="Tag not found")
@@ -1,61 +1,78 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api import deps
+from app.api.responses import ModelJSONResponse
 from app.crud import site as site_crud
-from app.models.user import User
 from app.schemas.site import SiteCreate, SiteListResponse, SiteRead, SiteUpdate
+from app.services import taxonomy
+from app.services.serializers import site_to_schema
 
 router = APIRouter()
 
 
-@router.get("", response_model=SiteListResponse)
-def list_sites(
+@router.get("", response_model=SiteListResponse, response_class=ModelJSONResponse)
+async def list_sites(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(deps.get_db),
-) -> SiteListResponse:
-    items = site_crud.list_sites(db, skip=skip, limit=limit)
-    return SiteListResponse(total=len(items), items=items)
+    db: AsyncSession = Depends(deps.get_db),
+) -> ModelJSONResponse:
+    sites = await site_crud.list_sites(db, skip=skip, limit=limit)
+    total = await site_crud.count_sites(db)
+    tag_ids = await site_crud.list_tag_ids(db, [site.id for site in sites])
+    categories = await taxonomy.get_categories(db)
+    tags = await taxonomy.get_tags(db)
+    items = [
+        site_to_schema(
+            site,
+            categories.get(site.category_id),
+            [tags[tag_id] for tag_id in tag_ids.get(site.id, ()) if tag_id in tags],
+        )
+        for site in sites
+    ]
+    response = SiteListResponse(total=total, items=items)
+    return ModelJSONResponse(response)
 
 
-@router.post("", response_model=SiteRead, status_code=status.HTTP_201_CREATED)
-def create_site(
+@router.post(
+    "",
+    response_model=SiteRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=deps.protected,
+)
+async def create_site(
     site_in: SiteCreate,
-    db: Session = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_db),
 ) -> SiteRead:
-    return site_crud.create_site(db, site_in)
+    return await site_crud.create_site(db, site_in)
 
 
 @router.get("/{site_id}", response_model=SiteRead)
-def get_site(site_id: int, db: Session = Depends(deps.get_db)) -> SiteRead:
-    site = site_crud.get_site(db, site_id)
+async def get_site(site_id: int, db: AsyncSession = Depends(deps.get_db)) -> SiteRead:
+    site = await site_crud.get_site(db, site_id)
     if not site:
         raise HTTPException(status_code=404, detail="Site not found")
     return site
 
 
-@router.put("/{site_id}", response_model=SiteRead)
-def update_site(
+@router.put("/{site_id}", response_model=SiteRead, dependencies=deps.protected)
+async def update_site(
     site_id: int,
     site_in: SiteUpdate,
-    db: Session = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_db),
 ) -> SiteRead:
-    site = site_crud.get_site(db, site_id)
+    site = await site_crud.get_site(db, site_id)
     if not site:
         raise HTTPException(status_code=404, detail="Site not found")
-    return site_crud.update_site(db, site, site_in)
+    return await site_crud.update_site(db, site, site_in)
 
 
-@router.delete("/{site_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_site(
+@router.delete("/{site_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=deps.protected)
+async def delete_site(
     site_id: int,
-    db: Session = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_db),
 ) -> None:
-    site = site_crud.get_site(db, site_id)
+    site = await site_crud.get_site(db, site_id)
     if not site:
         raise HTTPException(status_code=404, detail="Site not found")
-    site_crud.delete_site(db, site)
+    await site_crud.delete_site(db, site)
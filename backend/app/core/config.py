@@ -11,6 +11,11 @@ class Settings(BaseSettings):
     secret_key: str = Field("change-me", min_length=8)
     access_token_expire_minutes: int = 60
     database_url: str = "sqlite:///./data/app.db"
+    # 连接池配置（仅对非 SQLite 数据库生效）
+    # 固定 25 个连接、不额外溢出：高并发下比放任溢出更稳定，也不会压垮数据库
+    database_pool_size: int = 25
+    database_max_overflow: int = 0
+    database_pool_recycle_seconds: int = 1800
     environment: str = "local"
     scheduler_timezone: str = "Asia/Shanghai"
     data_dir: Path = Path("./data")
@@ -1,24 +1,34 @@
 from typing import Sequence
 
-from sqlmodel import Session, select
+from sqlalchemy import func
+from sqlalchemy.orm import raiseload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.automation import AutomationFlow
 from app.schemas.flow import AutomationFlowCreate, AutomationFlowUpdate
 
 
-def list_flows(session: Session, *, skip: int = 0, limit: int = 20) -> list[AutomationFlow]:
-    statement = select(AutomationFlow).offset(skip).limit(limit)
-    results: Sequence[AutomationFlow] = session.exec(statement).all()
+async def list_flows(
+    session: AsyncSession, *, skip: int = 0, limit: int = 20
+) -> list[AutomationFlow]:
+    # flow_to_schema only reads columns; raiseload keeps a future relationship access from
+    # silently turning this into an N+1.
+    statement = select(AutomationFlow).options(raiseload("*")).offset(skip).limit(limit)
+    results: Sequence[AutomationFlow] = (await session.exec(statement)).all()
     return list(results)
 
 
-def get_flow(session: Session, flow_id: int) -> AutomationFlow | None:
-    return session.get(AutomationFlow, flow_id)
+async def count_flows(session: AsyncSession) -> int:
+    statement = select(func.count(AutomationFlow.id))
+    return (await session.exec(statement)).one()
 
 
-def create_flow(session: Session, flow_in: AutomationFlowCreate) -> AutomationFlow:
-    import json
-    
+async def get_flow(session: AsyncSession, flow_id: int) -> AutomationFlow | None:
+    return await session.get(AutomationFlow, flow_id)
+
+
+async def create_flow(session: AsyncSession, flow_in: AutomationFlowCreate) -> AutomationFlow:
     flow = AutomationFlow(
         site_id=flow_in.site_id,
         name=flow_in.name,
@@ -31,29 +41,31 @@ def create_flow(session: Session, flow_in: AutomationFlowCreate) -> AutomationFl
         use_cdp_mode=flow_in.use_cdp_mode,
         cdp_port=flow_in.cdp_port,
         cdp_user_data_dir=flow_in.cdp_user_data_dir,
-        dsl=json.dumps(flow_in.dsl) if isinstance(flow_in.dsl, dict) else flow_in.dsl,
+        block_resources=flow_in.block_resources,
+        disable_animations=flow_in.disable_animations,
+        persist_storage_state=flow_in.persist_storage_state,
+        dsl=flow_in.dsl,
     )
     session.add(flow)
-    session.commit()
-    session.refresh(flow)
+    await session.commit()
+    await session.refresh(flow)
     return flow
 
 
-def update_flow(session: Session, flow: AutomationFlow, flow_in: AutomationFlowUpdate) -> AutomationFlow:
-    import json
-    
+async def update_flow(
+    session: AsyncSession, flow: AutomationFlow, flow_in: AutomationFlowUpdate
+) -> AutomationFlow:
     data = flow_in.model_dump(exclude_unset=True)
-    dsl = data.pop("dsl", None)
+    if data.get("dsl") is None:
+        data.pop("dsl", None)
     for field, value in data.items():
         setattr(flow, field, value)
-    if dsl is not None:
-        flow.dsl = json.dumps(dsl) if isinstance(dsl, dict) else dsl
     session.add(flow)
-    session.commit()
-    session.refresh(flow)
+    await session.commit()
+    await session.refresh(flow)
     return flow
 
 
-def delete_flow(session: Session, flow: AutomationFlow) -> None:
-    session.delete(flow)
-    session.commit()
+async def delete_flow(session: AsyncSession, flow: AutomationFlow) -> None:
+    await session.delete(flow)
+    await session.commit()
@@ -1,34 +1,44 @@
 from typing import Optional, Sequence
 
-from sqlmodel import Session, select
+from sqlalchemy import exists, func
+from sqlalchemy.orm import defer, raiseload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.checkin import CheckinHistory
 
+# List responses never include the full log; keep it out of the SELECT and fail loudly if read.
+_LIST_OPTIONS = (defer(CheckinHistory.log, raiseload=True), raiseload("*"))
+
 
 def _apply_error_filter(statement, error_type: Optional[str]):
     if error_type:
-        pattern = f'%"{error_type}"%'
-        statement = statement.where(CheckinHistory.error_types.like(pattern))
+        # Match whole array elements via json_each instead of a LIKE substring scan,
+        # so e.g. "timeout" no longer matches "navigation_timeout". json_each is
+        # SQLite's table-valued JSON function; like the startup migrations, SQLite-only.
+        codes = func.json_each(CheckinHistory.error_types).table_valued("value")
+        statement = statement.where(exists().select_from(codes).where(codes.c.value == error_type))
     return statement
 
 
-def list_all(
-    session: Session, *, skip: int = 0, limit: int = 50, error_type: str | None = None
+async def list_all(
+    session: AsyncSession, *, skip: int = 0, limit: int = 50, error_type: str | None = None
 ) -> list[CheckinHistory]:
     """List all history records."""
     statement = (
         select(CheckinHistory)
+        .options(*_LIST_OPTIONS)
         .order_by(CheckinHistory.started_at.desc())
         .offset(skip)
         .limit(limit)
     )
     statement = _apply_error_filter(statement, error_type)
-    results: Sequence[CheckinHistory] = session.exec(statement).all()
+    results: Sequence[CheckinHistory] = (await session.exec(statement)).all()
     return list(results)
 
 
-def list_by_flow(
-    session: Session,
+async def list_by_flow(
+    session: AsyncSession,
     flow_id: int,
     *,
     skip: int = 0,
@@ -38,31 +48,39 @@ def list_by_flow(
     """List history records for a specific flow."""
     statement = (
         select(CheckinHistory)
+        .options(*_LIST_OPTIONS)
         .where(CheckinHistory.flow_id == flow_id)
         .order_by(CheckinHistory.started_at.desc())
         .offset(skip)
         .limit(limit)
     )
     statement = _apply_error_filter(statement, error_type)
-    results: Sequence[CheckinHistory] = session.exec(statement).all()
+    results: Sequence[CheckinHistory] = (await session.exec(statement)).all()
     return list(results)
 
 
-def get_by_id(session: Session, history_id: int) -> CheckinHistory | None:
+async def get_by_id(session: AsyncSession, history_id: int) -> CheckinHistory | None:
     """Get a single history record by ID."""
-    return session.get(CheckinHistory, history_id)
+    return await session.get(CheckinHistory, history_id)
 
 
-def delete_history(session: Session, history: CheckinHistory) -> None:
+async def delete_history(session: AsyncSession, history: CheckinHistory) -> None:
     """Delete a history record."""
-    session.delete(history)
-    session.commit()
+    await session.delete(history)
+    await session.commit()
 
 
-def count_all(session: Session, error_type: str | None = None) -> int:
+async def count_all(session: AsyncSession, error_type: str | None = None) -> int:
     """Count total history records."""
-    from sqlalchemy import func
-
     statement = select(func.count(CheckinHistory.id))
     statement = _apply_error_filter(statement, error_type)
-    return session.exec(statement).one()
+    return (await session.exec(statement)).one()
+
+
+async def count_by_flow(
+    session: AsyncSession, flow_id: int, error_type: str | None = None
+) -> int:
+    """Count history records for a specific flow."""
+    statement = select(func.count(CheckinHistory.id)).where(CheckinHistory.flow_id == flow_id)
+    statement = _apply_error_filter(statement, error_type)
+    return (await session.exec(statement)).one()
@@ -1,31 +1,60 @@
 from typing import Sequence
 
-from sqlalchemy.orm import selectinload
-from sqlmodel import Session, select
+from sqlalchemy import func
+from sqlalchemy.orm import raiseload, selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models.site import Site, Tag
+from app.models.site import Site, SiteTagLink, Tag
 from app.schemas.site import SiteCreate, SiteUpdate
 
 
-def list_sites(session: Session, *, skip: int = 0, limit: int = 20) -> list[Site]:
-    statement = select(Site).options(selectinload(Site.tags)).offset(skip).limit(limit)
-    results: Sequence[Site] = session.exec(statement).all()
+async def list_sites(session: AsyncSession, *, skip: int = 0, limit: int = 20) -> list[Site]:
+    # Category and tags are stitched in from the taxonomy cache (see list_tag_ids), so no
+    # relationship is loaded here and any attempt to lazy load one raises.
+    statement = select(Site).options(raiseload("*")).offset(skip).limit(limit)
+    results: Sequence[Site] = (await session.exec(statement)).all()
     return list(results)
 
 
-def get_site(session: Session, site_id: int) -> Site | None:
-    statement = select(Site).where(Site.id == site_id).options(selectinload(Site.tags))
-    return session.exec(statement).first()
+async def list_tag_ids(session: AsyncSession, site_ids: list[int]) -> dict[int, list[int]]:
+    """Map each site id to its tag ids with a single query on the link table."""
+    if not site_ids:
+        return {}
+    statement = select(SiteTagLink.site_id, SiteTagLink.tag_id).where(
+        SiteTagLink.site_id.in_(site_ids)
+    )
+    tag_ids: dict[int, list[int]] = {}
+    for site_id, tag_id in (await session.exec(statement)).all():
+        tag_ids.setdefault(site_id, []).append(tag_id)
+    return tag_ids
+
+
+async def count_sites(session: AsyncSession) -> int:
+    statement = select(func.count(Site.id))
+    return (await session.exec(statement)).one()
+
+
+async def get_site(session: AsyncSession, site_id: int) -> Site | None:
+    statement = (
+        select(Site)
+        .where(Site.id == site_id)
+        .options(selectinload(Site.category), selectinload(Site.tags))
+    )
+    return (await session.exec(statement)).first()
 
 
-def _resolve_tags(session: Session, tag_ids: list[int]) -> list[Tag]:
+async def _resolve_tags(session: AsyncSession, tag_ids: list[int]) -> list[Tag]:
     if not tag_ids:
         return []
     statement = select(Tag).where(Tag.id.in_(tag_ids))
-    return list(session.exec(statement).all())
+    return list((await session.exec(statement)).all())
 
 
-def create_site(session: Session, site_in: SiteCreate) -> Site:
+async def create_site(session: AsyncSession, site_in: SiteCreate) -> Site:
+    # Tags go into the constructor: assigning the collection after a flush would lazy load it,
+    # which an AsyncSession cannot do.
+    tags = await _resolve_tags(session, site_in.tag_ids)
     site = Site(
         name=site_in.name,
         url=str(site_in.url),
@@ -33,16 +62,16 @@ def create_site(session: Session, site_in: SiteCreate) -> Site:
         category_id=site_in.category_id,
         sort_order=site_in.sort_order,
         is_active=site_in.is_active,
+        tags=tags,
     )
     session.add(site)
-    session.flush()
-    site.tags = _resolve_tags(session, site_in.tag_ids)
-    session.commit()
-    session.refresh(site)
-    return get_site(session, site.id)
+    await session.commit()
+    # Sessions keep state across commit and tags are already in memory; only category is unloaded.
+    await session.refresh(site, attribute_names=["category"])
+    return site
 
 
-def update_site(session: Session, site: Site, site_in: SiteUpdate) -> Site:
+async def update_site(session: AsyncSession, site: Site, site_in: SiteUpdate) -> Site:
     data = site_in.model_dump(exclude_unset=True)
     if "url" in data and data["url"] is not None:
         data["url"] = str(data["url"])
@@ -53,14 +82,14 @@ def update_site(session: Session, site: Site, site_in: SiteUpdate) -> Site:
         setattr(site, field, value)
 
     if tag_ids is not None:
-        site.tags = _resolve_tags(session, tag_ids)
+        site.tags = await _resolve_tags(session, tag_ids)
 
     session.add(site)
-    session.commit()
-    session.refresh(site)
-    return get_site(session, site.id)
+    await session.commit()
+    await session.refresh(site, attribute_names=["updated_at", "category"])
+    return site
 
 
-def delete_site(session: Session, site: Site) -> None:
-    session.delete(site)
-    session.commit()
+async def delete_site(session: AsyncSession, site: Site) -> None:
+    await session.delete(site)
+    await session.commit()
@@ -1,28 +1,34 @@
 from typing import Optional
 
-from sqlmodel import Session, select
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.security import get_password_hash, verify_password
 from app.models.user import User
 
 
-def get_by_email(session: Session, email: str) -> Optional[User]:
+async def get_by_email(session: AsyncSession, email: str) -> Optional[User]:
     statement = select(User).where(User.email == email)
-    return session.exec(statement).first()
+    return (await session.exec(statement)).first()
 
 
-def create_user(session: Session, email: str, password: str, full_name: str | None = None) -> User:
-    user = User(email=email, hashed_password=get_password_hash(password), full_name=full_name)
+async def create_user(
+    session: AsyncSession, email: str, password: str, full_name: str | None = None
+) -> User:
+    # bcrypt is deliberately slow; keep it off the event loop
+    hashed_password = await run_in_threadpool(get_password_hash, password)
+    user = User(email=email, hashed_password=hashed_password, full_name=full_name)
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
     return user
 
 
-def authenticate(session: Session, email: str, password: str) -> Optional[User]:
-    user = get_by_email(session, email)
+async def authenticate(session: AsyncSession, email: str, password: str) -> Optional[User]:
+    user = await get_by_email(session, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await run_in_threadpool(verify_password, password, user.hashed_password):
         return None
     return user
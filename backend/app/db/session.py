@@ -1,21 +1,76 @@
 from contextlib import contextmanager
 import json
 
+import orjson
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
 from app.models import auth, automation, checkin, site, user  # noqa: F401
 
+# Only SQLite is supported: the startup migrations below use PRAGMA table_info and
+# ALTER TABLE ADD COLUMN, and the history error-type filter uses json_each.
+_ASYNC_DRIVERS = {
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+
+def _async_database_url(url: str) -> str:
+    """Map a sync database URL onto its async driver equivalent."""
+    for prefix, async_prefix in _ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+
+def _json_serializer(value) -> str:
+    return orjson.dumps(value).decode()
+
+
+_is_sqlite = settings.database_url.startswith("sqlite")
+
 connect_args = {}
-if settings.database_url.startswith("sqlite"):
+# JSON columns (dsl, screenshot_files, error_types) go through orjson instead of stdlib json.
+engine_options = {"json_serializer": _json_serializer, "json_deserializer": orjson.loads}
+if _is_sqlite:
     connect_args["check_same_thread"] = False
+else:
+    engine_options |= {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_recycle": settings.database_pool_recycle_seconds,
+        "pool_pre_ping": True,
+    }
 
-engine = create_engine(settings.database_url, connect_args=connect_args)
+# Sync engine: startup migrations, CLI scripts and the executor's worker threads.
+engine = create_engine(settings.database_url, connect_args=connect_args, **engine_options)
+
+# Async engine: request handlers, so DB I/O never blocks the event loop or threadpool.
+async_engine = create_async_engine(_async_database_url(settings.database_url), **engine_options)
+
+
+def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    # WAL lets the API read while executor threads write history rows.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+if _is_sqlite:
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, expire_on_commit=False
+)
 
 
 def init_db() -> None:
     SQLModel.metadata.create_all(bind=engine)
     _ensure_history_columns()
+    _ensure_flow_columns()
 
 
 @contextmanager
@@ -31,13 +86,21 @@ def session_scope() -> Session:
         session.close()
 
 
-def get_session():
-    with Session(engine) as session:
+async def get_session():
+    async with AsyncSessionLocal() as session:
         yield session
 
 
+# create_all() only creates missing tables, so indexes added later are created here.
+_LATER_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_checkin_history_flow_id_started_at "
+    "ON checkin_history (flow_id, started_at)",
+    "CREATE INDEX IF NOT EXISTS ix_automation_flows_site_id ON automation_flows (site_id)",
+)
+
+
 def _ensure_history_columns() -> None:
-    """Ensure new JSON columns exist and migrate legacy screenshot data."""
+    """Ensure new JSON columns and indexes exist and migrate legacy screenshot data."""
     with engine.begin() as conn:
         existing_cols = {
             row[1]
@@ -55,20 +118,48 @@ def _ensure_history_columns() -> None:
                 "ALTER TABLE checkin_history ADD COLUMN error_types TEXT NOT NULL DEFAULT '[]'"
             )
 
+        for statement in _LATER_INDEXES:
+            conn.exec_driver_sql(statement)
+
         if "screenshot_paths" in existing_cols:
-            rows = conn.exec_driver_sql(
-                "SELECT id, screenshot_paths FROM checkin_history "
+            # One UPDATE for all rows: the path -> file name conversion runs as a SQL function.
+            conn.connection.dbapi_connection.create_function(
+                "legacy_screenshot_files", 1, _legacy_screenshot_files, deterministic=True
+            )
+            conn.exec_driver_sql(
+                "UPDATE checkin_history "
+                "SET screenshot_files = legacy_screenshot_files(screenshot_paths) "
                 "WHERE screenshot_paths IS NOT NULL AND screenshot_paths != ''"
-            ).fetchall()
-            for history_id, old_paths in rows:
-                if not old_paths:
-                    continue
-                files = [
-                    path.strip().split("/")[-1].split("\\")[-1]
-                    for path in old_paths.split(",")
-                    if path and path.strip()
-                ]
-                conn.exec_driver_sql(
-                    "UPDATE checkin_history SET screenshot_files = :files WHERE id = :history_id",
-                    {"files": json.dumps(files), "history_id": history_id},
-                )
+            )
+
+
+# Flow options added after automation_flows was first created: column name -> DDL.
+# DEFAULT only backfills existing rows, so those keep running as before (option off);
+# flows created afterwards get the model defaults.
+_LATER_FLOW_COLUMNS = {
+    "block_resources": "BOOLEAN NOT NULL DEFAULT 0",
+    "disable_animations": "BOOLEAN NOT NULL DEFAULT 0",
+    "persist_storage_state": "BOOLEAN NOT NULL DEFAULT 0",
+}
+
+
+def _ensure_flow_columns() -> None:
+    """Add flow option columns that create_all() cannot add to an existing table."""
+    with engine.begin() as conn:
+        existing_cols = {
+            row[1]
+            for row in conn.exec_driver_sql("PRAGMA table_info(automation_flows)").fetchall()
+        }
+        for name, ddl in _LATER_FLOW_COLUMNS.items():
+            if name not in existing_cols:
+                conn.exec_driver_sql(f"ALTER TABLE automation_flows ADD COLUMN {name} {ddl}")
+
+
+def _legacy_screenshot_files(old_paths: str) -> str:
+    """Convert a legacy comma-separated path list into a JSON array of file names."""
+    files = [
+        path.strip().split("/")[-1].split("\\")[-1]
+        for path in old_paths.split(",")
+        if path and path.strip()
+    ]
+    return json.dumps(files)
@@ -2,6 +2,7 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.api.router import api_router
@@ -11,7 +12,11 @@ from app.db.session import init_db
 
 
 def create_application() -> FastAPI:
-    application = FastAPI(title=settings.project_name, version=settings.version)
+    application = FastAPI(
+        title=settings.project_name,
+        version=settings.version,
+        default_response_class=ORJSONResponse,
+    )
 
     application.add_middleware(
         CORSMiddleware,
@@ -1,6 +1,7 @@
 from enum import Enum
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Any, List, Optional
 
+from sqlalchemy import JSON, Column
 from sqlmodel import Field, Relationship
 
 from app.models.base import IDModel, TimestampedModel
@@ -20,14 +21,18 @@ class FlowStatus(str, Enum):
 class AutomationFlow(IDModel, TimestampedModel, table=True):
     __tablename__ = "automation_flows"
 
-    site_id: int = Field(foreign_key="sites.id")
+    site_id: int = Field(foreign_key="sites.id", index=True)
     name: str = Field(max_length=200)
     description: Optional[str] = None
     cron_expression: Optional[str] = Field(
         default=None, description="Optional APScheduler cron expression"
     )
     is_active: bool = Field(default=True)
-    dsl: str = Field(description="JSON string describing actions")
+    dsl: dict[str, Any] = Field(
+        default_factory=dict,
+        sa_column=Column(JSON, nullable=False),
+        description="JSON document describing actions",
+    )
     last_status: FlowStatus = Field(default=FlowStatus.IDLE)
     headless: bool = Field(default=True, description="Run browser in headless mode")
     browser_type: str = Field(
@@ -45,6 +50,16 @@ class AutomationFlow(IDModel, TimestampedModel, table=True):
     cdp_user_data_dir: Optional[str] = Field(
         default=None, description="Browser user data directory (uses default profile if not specified)"
     )
+    block_resources: bool = Field(
+        default=True, description="Abort image/font/media and analytics requests (non-CDP mode)"
+    )
+    disable_animations: bool = Field(
+        default=True, description="Zero CSS animation/transition durations (non-CDP mode)"
+    )
+    persist_storage_state: bool = Field(
+        default=False,
+        description="Reuse cookies/localStorage from the last successful run (non-CDP mode)",
+    )
 
     site: "Site" = Relationship(back_populates="automation_flows")
     checkins: List["CheckinHistory"] = Relationship(
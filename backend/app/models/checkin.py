@@ -18,10 +18,11 @@ class CheckinHistory(IDModel, TimestampedModel, table=True):
         Index("ix_checkin_history_flow_id_status", "flow_id", "status"),
         # 时间范围查询索引
         Index("ix_checkin_history_started_at", "started_at"),
-        # 单独的 flow_id 索引（用于外键查询）
-        Index("ix_checkin_history_flow_id", "flow_id"),
+        # 单个流程的历史分页：按 flow_id 筛选并按 started_at 排序
+        Index("ix_checkin_history_flow_id_started_at", "flow_id", "started_at"),
     )
 
+    # index=True 生成 ix_checkin_history_flow_id（用于外键查询），不再重复声明
     flow_id: int = Field(foreign_key="automation_flows.id", index=True)
     status: FlowStatus = Field(default=FlowStatus.IDLE)
     started_at: datetime = Field(default_factory=datetime.utcnow)
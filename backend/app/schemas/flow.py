@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
 from pydantic import BaseModel, Field
 from sqlmodel import SQLModel
 
 from app.models.automation import FlowStatus
 
+# Mirrors the --browser choices accepted by run_automation.py
+BrowserType = Literal["chromium", "chrome", "edge", "firefox", "custom"]
+
 
 class AutomationFlowBase(SQLModel):
     site_id: int
@@ -16,11 +19,14 @@ class AutomationFlowBase(SQLModel):
     cron_expression: Optional[str] = None
     is_active: bool = True
     headless: bool = True
-    browser_type: str = "chromium"
+    browser_type: BrowserType = "chromium"
     browser_path: Optional[str] = None
     use_cdp_mode: bool = False
     cdp_port: int = 9222
     cdp_user_data_dir: Optional[str] = None
+    block_resources: bool = True
+    disable_animations: bool = True
+    persist_storage_state: bool = False
     dsl: dict[str, Any]
 
 
@@ -34,11 +40,14 @@ class AutomationFlowUpdate(SQLModel):
     cron_expression: Optional[str] = None
     is_active: Optional[bool] = None
     headless: Optional[bool] = None
-    browser_type: Optional[str] = None
+    browser_type: Optional[BrowserType] = None
     browser_path: Optional[str] = None
     use_cdp_mode: Optional[bool] = None
     cdp_port: Optional[int] = None
     cdp_user_data_dir: Optional[str] = None
+    block_resources: Optional[bool] = None
+    disable_animations: Optional[bool] = None
+    persist_storage_state: Optional[bool] = None
     dsl: Optional[dict[str, Any]] = None
 
 
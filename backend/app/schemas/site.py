@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, HttpUrl, field_validator
+from pydantic import BaseModel, HttpUrl, TypeAdapter, field_validator
 from sqlmodel import SQLModel
 
 
@@ -29,9 +29,15 @@ class TagCreate(TagBase):
     pass
 
 
+# Built once at import so list endpoints reuse the compiled core schema.
+CATEGORY_LIST_ADAPTER = TypeAdapter(list[CategoryRead])
+TAG_LIST_ADAPTER = TypeAdapter(list[TagRead])
+
+
 class SiteBase(SQLModel):
     name: str
-    url: HttpUrl
+    # Plain str on the read path; SiteCreate/SiteUpdate validate incoming URLs.
+    url: str
     description: Optional[str] = None
     category_id: Optional[int] = None
     tag_ids: list[int] = []
@@ -47,7 +53,7 @@ class SiteBase(SQLModel):
 
 
 class SiteCreate(SiteBase):
-    ...
+    url: HttpUrl
 
 
 class SiteUpdate(SQLModel):
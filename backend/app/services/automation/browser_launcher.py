@@ -1,6 +1,9 @@
 """Browser launcher utility for CDP mode with auto-start capability."""
 import asyncio
+import http.client
 import logging
+import os
+import shutil
 import socket
 import subprocess
 import time
@@ -49,6 +52,77 @@ def is_cdp_ready(port: int, verbose: bool = False) -> bool:
     return False
 
 
+def _probe_cdp(conn: http.client.HTTPConnection) -> bool:
+    """Probe /json/version on a reusable connection; any failure means not ready yet."""
+    try:
+        conn.request("GET", "/json/version")
+        response = conn.getresponse()
+        response.read()
+        return response.status == 200
+    except (OSError, http.client.HTTPException):
+        # Drop the broken socket; the next request() reconnects
+        conn.close()
+        return False
+
+
+async def wait_for_cdp_ready(
+    port: int, max_wait: float = 5.0, max_delay: float = 0.5
+) -> bool:
+    """Poll /json/version with exponential backoff (20ms doubling, capped at max_delay)."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_wait
+    delay = 0.02
+    probe = http.client.HTTPConnection("localhost", port, timeout=1)
+    try:
+        while True:
+            if await asyncio.to_thread(_probe_cdp, probe):
+                return True
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+    finally:
+        probe.close()
+
+
+def _clone_file(src: str, dst: str, *, follow_symlinks: bool = True) -> str:
+    """copytree copy_function that lets the kernel copy (or reflink) file data.
+
+    copy_file_range keeps the bytes out of user space and clones extents outright on
+    CoW filesystems (Btrfs, XFS); anything it cannot handle falls back to copy2.
+    """
+    if hasattr(os, "copy_file_range") and not os.path.islink(src):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            shutil.copystat(src, dst)
+            return dst
+        except OSError:
+            pass
+    return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+
+
+# Common browser install locations on Windows, in lookup order
+_BROWSER_PATHS: dict[str, tuple[Path, ...]] = {
+    "chrome": (
+        Path(r"C:\Program Files\Google\Chrome\Application\chrome.exe"),
+        Path(r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"),
+        Path.home() / "AppData" / "Local" / "Google" / "Chrome" / "Application" / "chrome.exe",
+    ),
+    "edge": (
+        Path(r"C:\Program Files\Microsoft\Edge\Application\msedge.exe"),
+        Path(r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe"),
+        Path.home() / "AppData" / "Local" / "Microsoft" / "Edge" / "Application" / "msedge.exe",
+    ),
+}
+
+
 def find_browser_executable(browser_type: str, custom_path: Optional[str] = None) -> Optional[str]:
     """
     Find browser executable path.
@@ -62,51 +136,34 @@ def find_browser_executable(browser_type: str, custom_path: Optional[str] = None
     """
     if custom_path and Path(custom_path).exists():
         return custom_path
-    
-    # Common browser paths on Windows
-    common_paths = {
-        "chrome": [
-            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-            Path.home() / "AppData" / "Local" / "Google" / "Chrome" / "Application" / "chrome.exe",
-        ],
-        "edge": [
-            r"C:\Program Files\Microsoft\Edge\Application\msedge.exe",
-            r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
-            Path.home() / "AppData" / "Local" / "Microsoft" / "Edge" / "Application" / "msedge.exe",
-        ],
-    }
-    
-    # Try common paths for the browser type
-    for path in common_paths.get(browser_type, []):
-        p = Path(path) if isinstance(path, str) else path
-        if p.exists():
-            return str(p)
-    
-    return None
+    return next((str(path) for path in _BROWSER_PATHS.get(browser_type, ()) if path.exists()), None)
+
+
+# Windows user data directories (relative to the home dir) that seed the CDP profile.
+# Deliberately not browser_utils' cross-platform lookup: the first-run copy below clones
+# the whole directory, and Linux/macOS profiles are not meant to be copied wholesale.
+_SEED_USER_DATA_DIRS: dict[str, tuple[str, ...]] = {
+    "chrome": ("AppData", "Local", "Google", "Chrome", "User Data"),
+    "edge": ("AppData", "Local", "Microsoft", "Edge", "User Data"),
+}
 
 
 def get_default_user_data_dir(browser_type: str) -> Optional[str]:
     """
-    Get default user data directory for the browser.
+    Get the browser's Windows user data directory, used to seed the CDP profile.
     This is where user's login states, bookmarks, extensions are stored.
     
     Args:
-        browser_type: Browser type (chrome, edge, chromium)
+        browser_type: Browser type (chrome, edge)
         
     Returns:
         Path to user data directory or None if not found
     """
-    user_data_dirs = {
-        "chrome": Path.home() / "AppData" / "Local" / "Google" / "Chrome" / "User Data",
-        "edge": Path.home() / "AppData" / "Local" / "Microsoft" / "Edge" / "User Data",
-    }
-    
-    default_dir = user_data_dirs.get(browser_type)
-    if default_dir and default_dir.exists():
-        return str(default_dir)
-    
-    return None
+    parts = _SEED_USER_DATA_DIRS.get(browser_type)
+    if parts is None:
+        return None
+    default_dir = Path.home().joinpath(*parts)
+    return str(default_dir) if default_dir.exists() else None
 
 
 class BrowserManager:
@@ -116,7 +173,7 @@ class BrowserManager:
         self.process: Optional[subprocess.Popen] = None
         self.port: Optional[int] = None
     
-    def start_browser(
+    async def start_browser_async(
         self,
         browser_type: str,
         port: int = 9222,
@@ -125,7 +182,7 @@ class BrowserManager:
         headless: bool = False,
     ) -> bool:
         """
-        Start browser with remote debugging port.
+        Start browser with remote debugging port without blocking the event loop.
         
         Args:
             browser_type: Browser type (chrome, edge)
@@ -152,9 +209,6 @@ class BrowserManager:
         logger.info(f"Browser path: {browser_path}")
         
         # Determine user data directory
-        import tempfile
-        import shutil
-        
         # Strategy: Copy entire User Data from real browser (first time only)
         # This preserves complete configuration and allows new logins to persist
         if not user_data_dir:
@@ -184,8 +238,11 @@ class BrowserManager:
                     
                     try:
                         # Copy entire User Data directory
+                        copied_entries = 0
+
                         def ignore_locked_files(directory, files):
                             """Ignore locked files and temporary files"""
+                            nonlocal copied_entries
                             ignore = []
                             for filename in files:
                                 if (filename.endswith('-lock') or 
@@ -195,18 +252,21 @@ class BrowserManager:
                                     filename == 'SingletonSocket' or
                                     filename == 'SingletonCookie'):
                                     ignore.append(filename)
+                            # Called once per directory, so the copy count comes for free
+                            copied_entries += len(files) - len(ignore)
                             return ignore
                         
-                        shutil.copytree(
+                        await asyncio.to_thread(
+                            shutil.copytree,
                             source_profile, 
                             cdp_profile_dir,
                             ignore=ignore_locked_files,
+                            copy_function=_clone_file,
                             ignore_dangling_symlinks=True,
                             dirs_exist_ok=False
                         )
                         
-                        file_count = len(list(cdp_profile_dir.rglob('*')))
-                        logger.info(f"✅ Successfully copied {file_count:,} files/folders")
+                        logger.info(f"✅ Successfully copied {copied_entries:,} files/folders")
                         logger.info("")
                         logger.info("💡 Benefits:")
                         logger.info("   ✅ Has all your bookmarks and favorites")
@@ -272,51 +332,21 @@ class BrowserManager:
             
             # Wait for browser to be ready
             max_wait = 30  # seconds - increased for slower systems
-            start_time = time.time()
+            start_time = time.monotonic()
             
             logger.info(f"Waiting for browser to initialize (max {max_wait}s)...")
             logger.info(f"Browser process PID: {self.process.pid}")
             
-            port_found = False
-            check_count = 0
-            while time.time() - start_time < max_wait:
-                check_count += 1
-                
-                # Check port every iteration
-                port_active = is_port_in_use(port)
-                
-                if not port_found and port_active:
-                    elapsed = time.time() - start_time
-                    logger.info(f"✅ Browser port {port} is active after {elapsed:.1f}s")
-                    port_found = True
-                
-                # Check if CDP is actually ready
-                if port_found:
-                    cdp_ready = is_cdp_ready(port)
-                    if check_count % 4 == 0:  # Log every 2 seconds
-                        logger.info(f"Checking CDP readiness... (attempt {check_count//4}, port_active={port_active}, cdp_ready={cdp_ready})")
-                    
-                    if cdp_ready:
-                        elapsed = time.time() - start_time
-                        logger.info(f"✅ CDP interface ready after {elapsed:.1f}s")
-                        # Small additional wait to ensure stability
-                        time.sleep(1)
-                        logger.info(f"✅ Browser started successfully on port {port}")
-                        return True
-                else:
-                    if check_count % 4 == 0:  # Log every 2 seconds
-                        logger.info(f"Waiting for port... (attempt {check_count//4}, port_active={port_active})")
-                
-                time.sleep(0.5)
-            
+            if await wait_for_cdp_ready(port, max_wait=max_wait):
+                elapsed = time.monotonic() - start_time
+                logger.info(f"✅ CDP interface ready after {elapsed:.1f}s")
+                # Small additional wait to ensure stability
+                await asyncio.sleep(1)
+                logger.info(f"✅ Browser started successfully on port {port}")
+                return True
+
             logger.error(f"❌ Browser failed to start within {max_wait}s timeout")
-            logger.error(f"Port found: {port_found}, Check count: {check_count}")
-            if port_found:
-                logger.error("Port was active but CDP interface did not respond")
-                logger.error(f"Final CDP check: {is_cdp_ready(port)}")
-            else:
-                logger.error(f"Port {port} was never detected as active")
-                logger.error(f"Final port check: {is_port_in_use(port)}")
+            logger.error(f"CDP interface on port {port} never responded")
             
             # Try to get process status
             if self.process.poll() is None:
@@ -1,8 +1,29 @@
 """Browser utilities for auto-detecting user data directories."""
-import os
 from pathlib import Path
 from typing import Optional
 
+_HOME = Path.home()
+
+# Candidate user data locations per browser, in lookup order (Windows, Linux, macOS).
+_USER_DATA_DIRS: dict[str, tuple[Path, ...]] = {
+    "chrome": (
+        _HOME / "AppData" / "Local" / "Google" / "Chrome" / "User Data",
+        _HOME / ".config" / "google-chrome",
+        _HOME / "Library" / "Application Support" / "Google" / "Chrome",
+    ),
+    "edge": (
+        _HOME / "AppData" / "Local" / "Microsoft" / "Edge" / "User Data",
+        _HOME / ".config" / "microsoft-edge",
+        _HOME / "Library" / "Application Support" / "Microsoft Edge",
+    ),
+    # Firefox keeps profiles one level down
+    "firefox": (
+        _HOME / "AppData" / "Roaming" / "Mozilla" / "Firefox" / "Profiles",
+        _HOME / ".mozilla" / "firefox",
+        _HOME / "Library" / "Application Support" / "Firefox" / "Profiles",
+    ),
+}
+
 
 def get_default_user_data_dir(browser_type: str) -> Optional[str]:
     """
@@ -14,38 +35,8 @@ def get_default_user_data_dir(browser_type: str) -> Optional[str]:
     Returns:
         Path to user data directory, or None if not found
     """
-    user_home = Path.home()
-    
-    if browser_type == "chrome":
-        # Chrome user data locations
-        possible_paths = [
-            user_home / "AppData" / "Local" / "Google" / "Chrome" / "User Data",
-            user_home / ".config" / "google-chrome",  # Linux
-            user_home / "Library" / "Application Support" / "Google" / "Chrome",  # macOS
-        ]
-    elif browser_type == "edge":
-        # Edge user data locations
-        possible_paths = [
-            user_home / "AppData" / "Local" / "Microsoft" / "Edge" / "User Data",
-            user_home / ".config" / "microsoft-edge",  # Linux
-            user_home / "Library" / "Application Support" / "Microsoft Edge",  # macOS
-        ]
-    elif browser_type == "firefox":
-        # Firefox profiles location (different structure)
-        possible_paths = [
-            user_home / "AppData" / "Roaming" / "Mozilla" / "Firefox" / "Profiles",
-            user_home / ".mozilla" / "firefox",  # Linux
-            user_home / "Library" / "Application Support" / "Firefox" / "Profiles",  # macOS
-        ]
-    else:
-        return None
-    
-    # Return first existing path
-    for path in possible_paths:
-        if path.exists():
-            return str(path)
-    
-    return None
+    candidates = _USER_DATA_DIRS.get(browser_type, ())
+    return next((str(path) for path in candidates if path.exists()), None)
 
 
 def get_automation_profile_path(browser_type: str) -> Optional[str]:
@@ -210,8 +210,11 @@ class SharedBrowserExecutor:
         Returns:
             Optional[Page]: 空闲页面，或None
         """
-        for page in context.pages:
-            if not await self.check_page_activity(page):
+        # 所有标签页的可见性检查并发发出，而不是逐个等待
+        pages = context.pages
+        activity = await asyncio.gather(*(self.check_page_activity(page) for page in pages))
+        for page, is_active in zip(pages, activity):
+            if not is_active:
                 logger.info(f"找到空闲页面: {page.url}")
                 return page
         
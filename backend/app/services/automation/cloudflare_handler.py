@@ -1,12 +1,55 @@
 """Cloudflare challenge detection and handling."""
 import asyncio
 import logging
+import re
+import time
 from typing import Optional
 
-from patchright.async_api import Page
+from patchright.async_api import Page, Response
+from patchright.async_api import TimeoutError as PlaywrightTimeoutError
 
 logger = logging.getLogger(__name__)
 
+# Runs the whole detection in one evaluate() round-trip instead of a CDP call per selector.
+# Title match -> identify the variant by presence; otherwise look for a visible widget/page.
+# Each selector group arrives as one comma-joined selector, so it costs one DOM scan.
+_DETECT_JS = """
+({titlePattern, hcaptchaSelector, turnstileSelector, pageSelector}) => {
+    const present = (selector) => document.querySelector(selector) !== null;
+    const visible = (selector) => Array.from(document.querySelectorAll(selector)).some(
+        (el) => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== "hidden"
+    );
+    if (new RegExp(titlePattern, "i").test(document.title)) {
+        if (present(hcaptchaSelector)) return "hcaptcha";
+        if (present(turnstileSelector)) return "turnstile";
+        return "page";
+    }
+    if (visible(turnstileSelector)) return "turnstile";
+    if (visible(pageSelector)) return "page";
+    return "none";
+}
+"""
+
+# wait_for_function predicate: a MutationObserver marks the DOM dirty and detection only
+# re-runs after a change. Resolves with the first type not in `pending`; after a navigation
+# the new document installs a fresh observer.
+_WAIT_SETTLED_JS = """
+({bundle, pending}) => {
+    const detect = %s;
+    let watch = window.__cfWatch;
+    if (!watch) {
+        watch = window.__cfWatch = {dirty: true};
+        new MutationObserver(() => { watch.dirty = true; }).observe(document, {
+            subtree: true, childList: true, attributes: true, characterData: true,
+        });
+    }
+    if (!watch.dirty) return false;
+    watch.dirty = false;
+    const type = detect(bundle);
+    return pending.includes(type) ? false : type;
+}
+""" % _DETECT_JS.strip()
+
 
 class CloudflareHandler:
     """
@@ -40,6 +83,13 @@ class CloudflareHandler:
         "[data-sitekey]",  # Turnstile widget container
     ]
     
+    # hCaptcha indicators (only checked on CF challenge pages)
+    HCAPTCHA_SELECTORS = [
+        "iframe[src*='hcaptcha']",
+        "#cf-hcaptcha-container",
+        ".h-captcha",
+    ]
+    
     # Page title indicators
     CF_TITLE_KEYWORDS = [
         "just a moment",
@@ -49,18 +99,54 @@ class CloudflareHandler:
         "one more step",
     ]
     
+    # Main-document statuses Cloudflare answers challenges with
+    CF_SUSPECT_STATUSES = frozenset({403, 429, 503})
+    
+    # Argument for _DETECT_JS, built once; keywords become one case-insensitive alternation
+    _SELECTOR_BUNDLE = {
+        "titlePattern": "|".join(re.escape(keyword) for keyword in CF_TITLE_KEYWORDS),
+        "hcaptchaSelector": ",".join(HCAPTCHA_SELECTORS),
+        "turnstileSelector": ",".join(TURNSTILE_SELECTORS),
+        "pageSelector": ",".join(CF_PAGE_SELECTORS),
+    }
+    
     def __init__(
         self,
         enabled: bool = True,
-        check_probability: float = 0.3,  # 30% chance to check between steps
         max_wait_time: int = 45000,  # 45 seconds max wait for challenge
         check_after_navigate: bool = True,  # Always check after navigate
+        safety_check_interval: float = 30.0,  # Seconds between checks without navigation
     ):
         self.enabled = enabled
-        self.check_probability = check_probability
         self.max_wait_time = max_wait_time
         self.check_after_navigate = check_after_navigate
+        self.safety_check_interval = safety_check_interval
         self._challenge_count = 0
+        # Whether the last main-document response could be a challenge; None until one is seen
+        self._last_response_suspect: Optional[bool] = None
+        # Set when the page navigated since the last check
+        self._navigated = False
+        self._last_check = time.monotonic()
+    
+    def attach(self, page: Page) -> None:
+        """Track main-document responses so between-step checks can skip the DOM sweep."""
+        self._last_response_suspect = None
+        self._navigated = False
+        self._last_check = time.monotonic()
+        page.on("response", lambda response: self._track_response(page, response))
+    
+    def mark_navigated(self) -> None:
+        """Request a check before the next step (the page loaded a new document)."""
+        self._navigated = True
+    
+    def _track_response(self, page: Page, response: Response) -> None:
+        if response.frame != page.main_frame or response.request.resource_type != "document":
+            return
+        server = response.headers.get("server", "")
+        self._last_response_suspect = (
+            response.status in self.CF_SUSPECT_STATUSES or "cloudflare" in server.lower()
+        )
+        self.mark_navigated()
     
     async def should_check(self, after_navigate: bool = False) -> bool:
         """Determine if we should check for CF challenge."""
@@ -68,12 +154,21 @@ class CloudflareHandler:
             return False
         if after_navigate and self.check_after_navigate:
             return True
-        return random.random() < self.check_probability
+        return (
+            self._navigated
+            or time.monotonic() - self._last_check > self.safety_check_interval
+        )
     
-    async def check_and_handle(self, page: Page, timeout: Optional[int] = None) -> dict:
+    async def check_and_handle(
+        self, page: Page, timeout: Optional[int] = None, after_navigate: bool = False
+    ) -> dict:
         """
         Check for Cloudflare challenge and handle if detected.
         
+        Between steps (after_navigate=False) the DOM sweep is skipped when the last
+        main-document response neither had a challenge status nor came from Cloudflare,
+        unless the periodic safety check is due (catches script-injected Turnstile widgets).
+        
         Returns:
             dict with keys:
                 - detected: bool - whether CF challenge was detected
@@ -83,9 +178,16 @@ class CloudflareHandler:
         """
         if not self.enabled:
             return {"detected": False, "handled": True, "type": "none", "duration_ms": 0}
+        now = time.monotonic()
+        safety_due = now - self._last_check > self.safety_check_interval
+        self._navigated = False
+        self._last_check = now
+        if not after_navigate and not safety_due and self._last_response_suspect is False:
+            return {"detected": False, "handled": True, "type": "none", "duration_ms": 0}
         
         timeout = timeout or self.max_wait_time
-        start_time = asyncio.get_event_loop().time()
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         
         try:
             # First check: Is this a CF challenge page?
@@ -108,7 +210,7 @@ class CloudflareHandler:
             else:
                 handled = False
             
-            elapsed = int((asyncio.get_event_loop().time() - start_time) * 1000)
+            elapsed = int((loop.time() - start_time) * 1000)
             
             return {
                 "detected": True,
@@ -119,109 +221,88 @@ class CloudflareHandler:
             
         except Exception as e:
             logger.error(f"Error handling CF challenge: {e}")
-            elapsed = int((asyncio.get_event_loop().time() - start_time) * 1000)
+            elapsed = int((loop.time() - start_time) * 1000)
             return {"detected": True, "handled": False, "type": "error", "duration_ms": elapsed}
     
     async def _detect_challenge_type(self, page: Page) -> str:
         """Detect the type of Cloudflare challenge present."""
         try:
-            # Check page title first (fastest)
-            title = (await page.title()).lower()
-            for keyword in self.CF_TITLE_KEYWORDS:
-                if keyword in title:
-                    # It's a challenge page, determine specific type
-                    return await self._identify_challenge_variant(page)
-            
-            # Check for Turnstile iframe (can appear on any page)
-            for selector in self.TURNSTILE_SELECTORS:
-                try:
-                    element = await page.query_selector(selector)
-                    if element:
-                        is_visible = await element.is_visible()
-                        if is_visible:
-                            return "turnstile"
-                except Exception:
-                    pass
-            
-            # Check for CF page elements
-            for selector in self.CF_PAGE_SELECTORS:
-                try:
-                    element = await page.query_selector(selector)
-                    if element:
-                        is_visible = await element.is_visible()
-                        if is_visible:
-                            return "page"
-                except Exception:
-                    pass
-            
-            return "none"
-            
+            return await page.evaluate(_DETECT_JS, self._SELECTOR_BUNDLE)
         except Exception as e:
             logger.debug(f"Error detecting CF challenge: {e}")
             return "none"
     
-    async def _identify_challenge_variant(self, page: Page) -> str:
-        """Identify the specific variant of challenge on a CF page."""
-        # Check for hCaptcha
-        hcaptcha_selectors = [
-            "iframe[src*='hcaptcha']",
-            "#cf-hcaptcha-container",
-            ".h-captcha",
-        ]
-        for selector in hcaptcha_selectors:
-            try:
-                if await page.query_selector(selector):
-                    return "hcaptcha"
-            except Exception:
-                pass
-        
-        # Check for Turnstile
-        for selector in self.TURNSTILE_SELECTORS:
-            try:
-                if await page.query_selector(selector):
-                    return "turnstile"
-            except Exception:
-                pass
-        
-        # Default to page challenge (JS-based)
-        return "page"
+    async def _wait_until_settled(
+        self, page: Page, pending: list[str], timeout: int
+    ) -> Optional[str]:
+        """Wait in-page for the challenge type to leave `pending`; None on timeout."""
+        if timeout <= 0:
+            return None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout / 1000
+        try:
+            # Interval polling: requestAnimationFrame is throttled in background tabs
+            handle = await page.wait_for_function(
+                _WAIT_SETTLED_JS,
+                arg={"bundle": self._SELECTOR_BUNDLE, "pending": pending},
+                polling=250,
+                timeout=timeout,
+            )
+            return await handle.json_value()
+        except PlaywrightTimeoutError:
+            return None
+        except Exception as e:
+            # No verdict (e.g. the challenge navigated and destroyed the execution context):
+            # fall back to polling the detector for whatever budget is left
+            logger.debug(f"In-page CF wait failed, polling instead: {e}")
+            return await self._poll_until_settled(
+                page, pending, int((deadline - loop.time()) * 1000)
+            )
+
+    async def _poll_until_settled(
+        self, page: Page, pending: list[str], timeout: int
+    ) -> Optional[str]:
+        """Poll the detector once a second until the type leaves `pending`; None on timeout."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout / 1000
+        while True:
+            challenge_type = await self._detect_challenge_type(page)
+            if challenge_type not in pending:
+                return challenge_type
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(1.0, remaining))
     
     async def _handle_turnstile(self, page: Page, timeout: int) -> bool:
         """Wait for Turnstile to auto-resolve (Patchright makes browser appear human)."""
         logger.info("🔲 Waiting for Turnstile auto-resolution (Patchright anti-detect active)...")
 
-        start_time = asyncio.get_event_loop().time()
-
-        while (asyncio.get_event_loop().time() - start_time) * 1000 < timeout:
-            if await self._detect_challenge_type(page) == "none":
-                logger.info("✅ Turnstile challenge auto-resolved!")
-                return True
-            await asyncio.sleep(1)
+        if await self._wait_until_settled(page, ["turnstile", "page", "hcaptcha"], timeout):
+            logger.info("✅ Turnstile challenge auto-resolved!")
+            return True
 
         logger.warning(f"⚠️ Turnstile not resolved within {timeout}ms")
-        return await self._detect_challenge_type(page) == "none"
+        return False
     
     async def _handle_page_challenge(self, page: Page, timeout: int) -> bool:
         """Handle JS-based page challenge (auto-completing)."""
         logger.info("⏳ Waiting for JS challenge to auto-complete...")
         
-        start_time = asyncio.get_event_loop().time()
-        check_interval = 1.0  # Check every second
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout / 1000
+        challenge_type = await self._wait_until_settled(page, ["page"], timeout)
+        remaining = int((deadline - loop.time()) * 1000)
         
-        while (asyncio.get_event_loop().time() - start_time) * 1000 < timeout:
-            await asyncio.sleep(check_interval)
-            
-            challenge_type = await self._detect_challenge_type(page)
-            
-            if challenge_type == "none":
-                logger.info("✅ Page challenge completed!")
-                return True
-            elif challenge_type == "turnstile":
-                # Switched to Turnstile, handle it
-                return await self._handle_turnstile(page, timeout - int((asyncio.get_event_loop().time() - start_time) * 1000))
-            elif challenge_type == "hcaptcha":
-                logger.warning("⚠️ Challenge escalated to hCaptcha")
-                return await self._wait_for_manual_solve(page, timeout - int((asyncio.get_event_loop().time() - start_time) * 1000))
+        if challenge_type == "none":
+            logger.info("✅ Page challenge completed!")
+            return True
+        elif challenge_type == "turnstile":
+            # Switched to Turnstile, handle it
+            return await self._handle_turnstile(page, remaining)
+        elif challenge_type == "hcaptcha":
+            logger.warning("⚠️ Challenge escalated to hCaptcha")
+            return await self._wait_for_manual_solve(page, remaining)
         
         logger.warning(f"⚠️ Page challenge timeout after {timeout}ms")
         return False
@@ -234,14 +315,9 @@ class CloudflareHandler:
         logger.warning(f"   Timeout: {timeout/1000:.0f} seconds")
         logger.warning("=" * 50)
         
-        start_time = asyncio.get_event_loop().time()
-        
-        while (asyncio.get_event_loop().time() - start_time) * 1000 < timeout:
-            await asyncio.sleep(2)
-            
-            if await self._detect_challenge_type(page) == "none":
-                logger.info("✅ Manual solve completed!")
-                return True
+        if await self._wait_until_settled(page, ["turnstile", "page", "hcaptcha"], timeout):
+            logger.info("✅ Manual solve completed!")
+            return True
         
         return False
     
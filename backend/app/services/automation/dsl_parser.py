@@ -1,12 +1,13 @@
 """DSL Parser for automation flows."""
 from __future__ import annotations
 
-import json
 import logging
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -14,8 +15,7 @@ REPO_ROOT = Path(__file__).resolve().parents[4]
 DSL_SCHEMA_PATH = REPO_ROOT / "frontend" / "src" / "constants" / "dslSchema.json"
 
 try:
-    with DSL_SCHEMA_PATH.open("r", encoding="utf-8") as schema_file:
-        STEP_DEFINITIONS: dict[str, Any] = json.load(schema_file)
+    STEP_DEFINITIONS: dict[str, Any] = orjson.loads(DSL_SCHEMA_PATH.read_bytes())
 except FileNotFoundError:  # pragma: no cover - misconfiguration safeguard
     logger.error("DSL schema file not found at %s", DSL_SCHEMA_PATH)
     STEP_DEFINITIONS = {}
@@ -26,13 +26,68 @@ StepType = Enum(
     type=str,
 )
 
+_STR_TO_STEPTYPE: dict[str, StepType] = {step_type.value: step_type for step_type in StepType}
+
 REQUIRED_FIELDS: dict[str, list[str]] = {
     step: [field["name"] for field in config.get("fields", []) if field.get("required")]
     for step, config in STEP_DEFINITIONS.items()
 }
 
 
-@dataclass
+def _validate_extract(params: dict[str, Any]) -> None:
+    selector = params.get("selector")
+    variable = params.get("variable")
+    if selector is None or (isinstance(selector, str) and not selector.strip()):
+        raise ValueError("extract step requires 'selector' parameter")
+    if variable is None or (isinstance(variable, str) and not variable.strip()):
+        raise ValueError("extract step requires 'variable' parameter")
+
+
+def _validate_select(params: dict[str, Any]) -> None:
+    selector = params.get("selector")
+    value = params.get("value")
+    if selector is None or (isinstance(selector, str) and not selector.strip()):
+        raise ValueError("select step requires 'selector' parameter")
+    if value is None or (isinstance(value, str) and not value.strip()):
+        raise ValueError("select step requires 'value' parameter")
+
+
+def _validate_checkbox(params: dict[str, Any]) -> None:
+    if "selector" not in params:
+        raise ValueError("checkbox step requires 'selector' parameter")
+    if "checked" not in params:
+        raise ValueError("checkbox step requires 'checked' parameter")
+
+
+def _validate_scroll(params: dict[str, Any]) -> None:
+    if not has_any_value(params.get("selector"), params.get("x"), params.get("y")):
+        raise ValueError("scroll step requires selector or x/y parameter")
+
+
+def _validate_wait_time(params: dict[str, Any]) -> None:
+    duration = params.get("duration")
+    if not isinstance(duration, (int, float)):
+        raise ValueError("wait_time step requires numeric 'duration'")
+    if duration <= 0:
+        raise ValueError("wait_time duration must be greater than zero")
+
+
+_EXTRA_VALIDATORS: dict[str, Callable[[dict[str, Any]], None]] = {
+    "wait_time": _validate_wait_time,
+    "extract": _validate_extract,
+    "checkbox": _validate_checkbox,
+    "select": _validate_select,
+    "scroll": _validate_scroll,
+}
+
+# Per step type: (required field names, extra validator or None), built once at import
+_VALIDATORS: dict[StepType, tuple[tuple[str, ...], Callable[[dict[str, Any]], None] | None]] = {
+    step_type: (tuple(REQUIRED_FIELDS[step_type.value]), _EXTRA_VALIDATORS.get(step_type.value))
+    for step_type in StepType
+}
+
+
+@dataclass(slots=True, frozen=True)
 class ParsedStep:
     """Parsed automation step with validated parameters."""
 
@@ -42,66 +97,14 @@ class ParsedStep:
 
     def __post_init__(self):
         """Validate step parameters based on type."""
-        self._validate_required_fields()
-        if self.type == StepType.WAIT_TIME:
-            self._validate_wait_time()
-        if self.type == StepType.EXTRACT:
-            self._validate_extract()
-        if self.type == StepType.CHECKBOX:
-            self._validate_checkbox()
-        if self.type == StepType.SELECT:
-            self._validate_select()
-        if self.type == StepType.SCROLL:
-            self._validate_scroll()
-
-    def _validate_required_fields(self) -> None:
-        required = REQUIRED_FIELDS.get(self.type.value, [])
+        required, extra = _VALIDATORS[self.type]
+        params = self.params
         for field in required:
-            value = self.params.get(field)
-            if value is None:
-                raise ValueError(f"{self.type.value} step requires '{field}' parameter")
-            if isinstance(value, str) and not value.strip():
+            value = params.get(field)
+            if value is None or (isinstance(value, str) and not value.strip()):
                 raise ValueError(f"{self.type.value} step requires '{field}' parameter")
-
-    def _validate_extract(self) -> None:
-        selector = self.params.get("selector")
-        variable = self.params.get("variable")
-        if selector is None or (isinstance(selector, str) and not selector.strip()):
-            raise ValueError("extract step requires 'selector' parameter")
-        if variable is None or (isinstance(variable, str) and not variable.strip()):
-            raise ValueError("extract step requires 'variable' parameter")
-
-    def _validate_screenshot(self):
-        # Screenshot has optional params, no required validation
-        pass
-
-    def _validate_select(self) -> None:
-        selector = self.params.get("selector")
-        value = self.params.get("value")
-        if selector is None or (isinstance(selector, str) and not selector.strip()):
-            raise ValueError("select step requires 'selector' parameter")
-        if value is None or (isinstance(value, str) and not value.strip()):
-            raise ValueError("select step requires 'value' parameter")
-
-    def _validate_checkbox(self) -> None:
-        if "selector" not in self.params:
-            raise ValueError("checkbox step requires 'selector' parameter")
-        if "checked" not in self.params:
-            raise ValueError("checkbox step requires 'checked' parameter")
-
-    def _validate_scroll(self) -> None:
-        selector = self.params.get("selector")
-        x_coord = self.params.get("x")
-        y_coord = self.params.get("y")
-        if not has_any_value(selector, x_coord, y_coord):
-            raise ValueError("scroll step requires selector or x/y parameter")
-
-    def _validate_wait_time(self) -> None:
-        duration = self.params.get("duration")
-        if not isinstance(duration, (int, float)):
-            raise ValueError("wait_time step requires numeric 'duration'")
-        if duration <= 0:
-            raise ValueError("wait_time duration must be greater than zero")
+        if extra is not None:
+            extra(params)
 
 
 class DSLParser:
@@ -121,8 +124,8 @@ class DSLParser:
             ValueError: If DSL is invalid
         """
         try:
-            dsl_data = json.loads(dsl_json)
-        except json.JSONDecodeError as e:
+            dsl_data = orjson.loads(dsl_json)
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON: {e}")
 
         if not isinstance(dsl_data, dict):
@@ -135,13 +138,16 @@ class DSLParser:
         if not isinstance(steps, list):
             raise ValueError("'steps' must be an array")
 
-        parsed_steps = []
-        for idx, step in enumerate(steps):
-            try:
-                parsed_step = self._parse_step(step)
-                parsed_steps.append(parsed_step)
-            except Exception as e:
-                raise ValueError(f"Error parsing step {idx + 1}: {e}")
+        try:
+            parsed_steps = [self._parse_step(step) for step in steps]
+        except Exception:
+            # Slow path: re-parse one by one to report which step failed
+            for idx, step in enumerate(steps):
+                try:
+                    self._parse_step(step)
+                except Exception as e:
+                    raise ValueError(f"Error parsing step {idx + 1}: {e}")
+            raise
 
         logger.info(f"Successfully parsed {len(parsed_steps)} steps")
         return parsed_steps
@@ -155,15 +161,16 @@ class DSLParser:
             raise ValueError("Step must have 'type' field")
 
         step_type_str = step["type"]
-        if step_type_str not in STEP_DEFINITIONS:
+        step_type = _STR_TO_STEPTYPE.get(step_type_str)
+        if step_type is None:
             raise ValueError(
                 f"Unknown step type '{step_type_str}'. "
                 f"Supported types: {list(STEP_DEFINITIONS.keys())}"
             )
-        step_type = StepType(step_type_str)
 
-        params = {k: v for k, v in step.items() if k not in ["type", "description"]}
-        description = step.get("description")
+        params = step.copy()
+        del params["type"]
+        description = params.pop("description", None)
 
         return ParsedStep(type=step_type, params=params, description=description)
 
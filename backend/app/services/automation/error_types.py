@@ -1,5 +1,8 @@
 """Error type definitions for automation execution."""
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
 
 
 class ErrorType(str, Enum):
@@ -111,6 +114,36 @@ ERROR_PATTERNS = [
     # Generic selector/element patterns - MUST be last among element-related
     (["selector", "locator", "element"], ErrorType.ELEMENT_NOT_FOUND),
 ]
+# Freeze and lowercase once; classify_error lowercases the message, never the keywords
+ERROR_PATTERNS = tuple(
+    (tuple(keyword.lower() for keyword in keywords), error_type)
+    for keywords, error_type in ERROR_PATTERNS
+)
+
+# Straight-line `if keyword in text: return ErrorType.X` cascade generated from
+# ERROR_PATTERNS, in priority order. Each check is a C-level substring search; no
+# loops, iterators or tuple unpacking per call.
+def _build_classifier():
+    lines = ["def _classify_text(full_error):"]
+    for keywords, error_type in ERROR_PATTERNS:
+        for keyword in keywords:
+            lines.append(f"    if {keyword!r} in full_error: return ErrorType.{error_type.name}")
+    lines.append("    return ErrorType.UNKNOWN")
+    namespace: dict = {}
+    exec("\n".join(lines), {"ErrorType": ErrorType}, namespace)
+    return namespace["_classify_text"]
+
+
+_classify_text = _build_classifier()
+_classify_cached = lru_cache(maxsize=1024)(_classify_text)
+
+# Longer texts (stderr dumps, stack traces) are rarely repeated and are not worth keeping
+_CACHEABLE_LENGTH = 512
+
+
+@lru_cache(maxsize=256)
+def _type_name_prefix(error_cls: type) -> str:
+    return f"{error_cls.__name__.lower()} "
 
 
 def classify_error(error: Exception | str) -> ErrorType:
@@ -126,159 +159,153 @@ def classify_error(error: Exception | str) -> ErrorType:
     Returns:
         ErrorType enum value
     """
-    error_str = str(error).lower()
-    error_type_name = type(error).__name__.lower() if isinstance(error, Exception) else ""
-    
     # Combine error string and type name for matching
-    full_error = f"{error_type_name} {error_str}"
-    
-    # Check patterns in order (most specific first)
-    for keywords, error_type in ERROR_PATTERNS:
-        for keyword in keywords:
-            if keyword.lower() in full_error:
-                return error_type
-    
-    # If no pattern matched, return UNKNOWN
-    return ErrorType.UNKNOWN
+    prefix = _type_name_prefix(type(error)) if isinstance(error, Exception) else " "
+    full_error = prefix + str(error).lower()
+    if len(full_error) <= _CACHEABLE_LENGTH:
+        return _classify_cached(full_error)
+    return _classify_text(full_error)
+
+
+_INFO_MAP: Mapping[ErrorType, Mapping[str, str]] = MappingProxyType({
+    ErrorType.ELEMENT_NOT_FOUND: MappingProxyType({
+        "label": "元素未找到",
+        "description": "页面上未找到指定的元素",
+        "color": "orange"
+    }),
+    ErrorType.ELEMENT_NOT_VISIBLE: MappingProxyType({
+        "label": "元素不可见",
+        "description": "元素存在但不可见",
+        "color": "orange"
+    }),
+    ErrorType.ELEMENT_NOT_INTERACTABLE: MappingProxyType({
+        "label": "元素不可交互",
+        "description": "元素被遮挡或禁用",
+        "color": "orange"
+    }),
+    ErrorType.TIMEOUT: MappingProxyType({
+        "label": "超时",
+        "description": "操作超时未完成",
+        "color": "red"
+    }),
+    ErrorType.WAIT_TIMEOUT: MappingProxyType({
+        "label": "等待超时",
+        "description": "等待元素或条件超时",
+        "color": "red"
+    }),
+    ErrorType.NAVIGATION_ERROR: MappingProxyType({
+        "label": "导航错误",
+        "description": "页面导航失败",
+        "color": "red"
+    }),
+    ErrorType.PAGE_LOAD_ERROR: MappingProxyType({
+        "label": "页面加载失败",
+        "description": "页面未能正常加载",
+        "color": "red"
+    }),
+    ErrorType.BROWSER_CRASH: MappingProxyType({
+        "label": "浏览器崩溃",
+        "description": "浏览器进程崩溃",
+        "color": "red"
+    }),
+    ErrorType.BROWSER_CLOSED: MappingProxyType({
+        "label": "浏览器已关闭",
+        "description": "浏览器或页面意外关闭",
+        "color": "red"
+    }),
+    ErrorType.CDP_CONNECTION_ERROR: MappingProxyType({
+        "label": "CDP连接错误",
+        "description": "无法连接到浏览器调试端口",
+        "color": "red"
+    }),
+    ErrorType.CDP_DISCONNECTED: MappingProxyType({
+        "label": "CDP连接断开",
+        "description": "与浏览器的连接断开",
+        "color": "red"
+    }),
+    ErrorType.NETWORK_ERROR: MappingProxyType({
+        "label": "网络错误",
+        "description": "网络请求失败",
+        "color": "red"
+    }),
+    ErrorType.SSL_ERROR: MappingProxyType({
+        "label": "SSL错误",
+        "description": "SSL证书验证失败",
+        "color": "red"
+    }),
+    ErrorType.DNS_ERROR: MappingProxyType({
+        "label": "DNS错误",
+        "description": "域名解析失败",
+        "color": "red"
+    }),
+    ErrorType.PERMISSION_ERROR: MappingProxyType({
+        "label": "权限错误",
+        "description": "无权限执行操作",
+        "color": "volcano"
+    }),
+    ErrorType.FILE_ACCESS_ERROR: MappingProxyType({
+        "label": "文件访问错误",
+        "description": "无法访问文件",
+        "color": "volcano"
+    }),
+    ErrorType.VALIDATION_ERROR: MappingProxyType({
+        "label": "验证错误",
+        "description": "参数验证失败",
+        "color": "gold"
+    }),
+    ErrorType.DSL_PARSE_ERROR: MappingProxyType({
+        "label": "DSL解析错误",
+        "description": "流程配置格式错误",
+        "color": "gold"
+    }),
+    ErrorType.SELECTOR_INVALID: MappingProxyType({
+        "label": "选择器无效",
+        "description": "CSS/XPath选择器格式错误",
+        "color": "gold"
+    }),
+    ErrorType.MANUAL_STOP: MappingProxyType({
+        "label": "手动停止",
+        "description": "用户手动停止了执行",
+        "color": "blue"
+    }),
+    ErrorType.PROCESS_TIMEOUT: MappingProxyType({
+        "label": "进程超时",
+        "description": "执行进程超时被终止",
+        "color": "red"
+    }),
+    ErrorType.PROCESS_KILLED: MappingProxyType({
+        "label": "进程终止",
+        "description": "执行进程被强制终止",
+        "color": "red"
+    }),
+    ErrorType.ASSERTION_FAILED: MappingProxyType({
+        "label": "断言失败",
+        "description": "验证条件未满足",
+        "color": "orange"
+    }),
+    ErrorType.SCRIPT_ERROR: MappingProxyType({
+        "label": "脚本错误",
+        "description": "脚本执行出错",
+        "color": "red"
+    }),
+    ErrorType.JAVASCRIPT_ERROR: MappingProxyType({
+        "label": "JavaScript错误",
+        "description": "页面JavaScript执行错误",
+        "color": "red"
+    }),
+    ErrorType.UNKNOWN: MappingProxyType({
+        "label": "未知错误",
+        "description": "无法识别的错误类型",
+        "color": "default"
+    }),
+})
 
 
-def get_error_display_info(error_type: ErrorType) -> dict:
+def get_error_display_info(error_type: ErrorType) -> Mapping[str, str]:
     """
     Get display information for an error type.
     
     Returns:
-        Dict with 'label' (Chinese), 'description', and 'color' for UI display
+        Read-only mapping with 'label' (Chinese), 'description', and 'color' for UI display
     """
-    INFO_MAP = {
-        ErrorType.ELEMENT_NOT_FOUND: {
-            "label": "元素未找到",
-            "description": "页面上未找到指定的元素",
-            "color": "orange"
-        },
-        ErrorType.ELEMENT_NOT_VISIBLE: {
-            "label": "元素不可见",
-            "description": "元素存在但不可见",
-            "color": "orange"
-        },
-        ErrorType.ELEMENT_NOT_INTERACTABLE: {
-            "label": "元素不可交互",
-            "description": "元素被遮挡或禁用",
-            "color": "orange"
-        },
-        ErrorType.TIMEOUT: {
-            "label": "超时",
-            "description": "操作超时未完成",
-            "color": "red"
-        },
-        ErrorType.WAIT_TIMEOUT: {
-            "label": "等待超时",
-            "description": "等待元素或条件超时",
-            "color": "red"
-        },
-        ErrorType.NAVIGATION_ERROR: {
-            "label": "导航错误",
-            "description": "页面导航失败",
-            "color": "red"
-        },
-        ErrorType.PAGE_LOAD_ERROR: {
-            "label": "页面加载失败",
-            "description": "页面未能正常加载",
-            "color": "red"
-        },
-        ErrorType.BROWSER_CRASH: {
-            "label": "浏览器崩溃",
-            "description": "浏览器进程崩溃",
-            "color": "red"
-        },
-        ErrorType.BROWSER_CLOSED: {
-            "label": "浏览器已关闭",
-            "description": "浏览器或页面意外关闭",
-            "color": "red"
-        },
-        ErrorType.CDP_CONNECTION_ERROR: {
-            "label": "CDP连接错误",
-            "description": "无法连接到浏览器调试端口",
-            "color": "red"
-        },
-        ErrorType.CDP_DISCONNECTED: {
-            "label": "CDP连接断开",
-            "description": "与浏览器的连接断开",
-            "color": "red"
-        },
-        ErrorType.NETWORK_ERROR: {
-            "label": "网络错误",
-            "description": "网络请求失败",
-            "color": "red"
-        },
-        ErrorType.SSL_ERROR: {
-            "label": "SSL错误",
-            "description": "SSL证书验证失败",
-            "color": "red"
-        },
-        ErrorType.DNS_ERROR: {
-            "label": "DNS错误",
-            "description": "域名解析失败",
-            "color": "red"
-        },
-        ErrorType.PERMISSION_ERROR: {
-            "label": "权限错误",
-            "description": "无权限执行操作",
-            "color": "volcano"
-        },
-        ErrorType.FILE_ACCESS_ERROR: {
-            "label": "文件访问错误",
-            "description": "无法访问文件",
-            "color": "volcano"
-        },
-        ErrorType.VALIDATION_ERROR: {
-            "label": "验证错误",
-            "description": "参数验证失败",
-            "color": "gold"
-        },
-        ErrorType.DSL_PARSE_ERROR: {
-            "label": "DSL解析错误",
-            "description": "流程配置格式错误",
-            "color": "gold"
-        },
-        ErrorType.SELECTOR_INVALID: {
-            "label": "选择器无效",
-            "description": "CSS/XPath选择器格式错误",
-            "color": "gold"
-        },
-        ErrorType.MANUAL_STOP: {
-            "label": "手动停止",
-            "description": "用户手动停止了执行",
-            "color": "blue"
-        },
-        ErrorType.PROCESS_TIMEOUT: {
-            "label": "进程超时",
-            "description": "执行进程超时被终止",
-            "color": "red"
-        },
-        ErrorType.PROCESS_KILLED: {
-            "label": "进程终止",
-            "description": "执行进程被强制终止",
-            "color": "red"
-        },
-        ErrorType.ASSERTION_FAILED: {
-            "label": "断言失败",
-            "description": "验证条件未满足",
-            "color": "orange"
-        },
-        ErrorType.SCRIPT_ERROR: {
-            "label": "脚本错误",
-            "description": "脚本执行出错",
-            "color": "red"
-        },
-        ErrorType.JAVASCRIPT_ERROR: {
-            "label": "JavaScript错误",
-            "description": "页面JavaScript执行错误",
-            "color": "red"
-        },
-        ErrorType.UNKNOWN: {
-            "label": "未知错误",
-            "description": "无法识别的错误类型",
-            "color": "default"
-        },
-    }
-    return INFO_MAP.get(error_type, INFO_MAP[ErrorType.UNKNOWN])
+    return _INFO_MAP.get(error_type, _INFO_MAP[ErrorType.UNKNOWN])
@@ -2,14 +2,21 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import re
 import subprocess
 import sys
 import threading
+import time
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
 
+import orjson
+from sqlalchemy import insert
+
 from app.models.automation import AutomationFlow
+from app.models.checkin import CheckinHistory
 from app.core.config import settings
 from app.services.automation.process_manager import process_manager
 from app.services.automation.error_types import classify_error, ErrorType
@@ -17,6 +24,14 @@ from app.services.automation.process_output_parser import extract_json_payload
 
 logger = logging.getLogger(__name__)
 
+_BACKEND_DIR = Path(__file__).resolve().parents[3]
+# Entry point of the automation subprocess
+_SCRIPT_PATH = str(_BACKEND_DIR / "run_automation.py")
+_BACKEND_DIR_STR = str(_BACKEND_DIR)
+
+# Step error text: optional "[TYPE]" tag, then the main message (first line, before any "|")
+_STEP_ERROR_RE = re.compile(r"(?:\[(?P<type>[^\]]*)\])?\s*(?P<main>[^\n|]*)")
+
 
 @dataclass
 class ExecutionResult:
@@ -25,6 +40,50 @@ class ExecutionResult:
     execution_id: str | None = None
 
 
+def _save_history(history: CheckinHistory) -> None:
+    """Insert a finished run with one Core INSERT (no ORM flush or identity map)."""
+    from app.db.session import session_scope
+
+    with session_scope() as db:
+        db.execute(insert(CheckinHistory).values(history.model_dump(exclude={"id"})))
+
+
+def _build_command(flow: AutomationFlow, execution_id: str) -> list[str]:
+    """Build the run_automation.py command line for a flow."""
+    cmd_args = [
+        sys.executable,
+        _SCRIPT_PATH,
+        str(flow.id),
+        json.dumps(flow.dsl),
+        "--headless" if flow.headless else "--headed",
+        "--browser",
+        flow.browser_type,
+        "--execution-id",
+        execution_id,
+    ]
+
+    # Add browser path if custom
+    if flow.browser_path:
+        cmd_args.extend(["--browser-path", flow.browser_path])
+
+    # Add CDP mode flags if enabled
+    if flow.use_cdp_mode:
+        cmd_args.append("--use-cdp-mode")
+        cmd_args.extend(["--cdp-port", str(flow.cdp_port)])
+        if flow.cdp_user_data_dir:
+            cmd_args.extend(["--cdp-user-data-dir", flow.cdp_user_data_dir])
+
+    # Page-load tuning (only applied to fresh, non-CDP contexts by the runner)
+    if flow.block_resources:
+        cmd_args.append("--block-resources")
+    if flow.disable_animations:
+        cmd_args.append("--disable-animations")
+    if flow.persist_storage_state:
+        cmd_args.append("--persist-storage-state")
+
+    return cmd_args
+
+
 class AutomationExecutor:
     """Orchestration layer for running automation flows in separate process."""
 
@@ -38,9 +97,11 @@ class AutomationExecutor:
         Returns:
             ExecutionResult with status and message
         """
+        # Read once; the flow instance is detached and the completion thread outlives the request
+        flow_id = flow.id
         try:
             # Check if already running
-            if process_manager.is_running(flow.id):
+            if process_manager.is_running(flow_id):
                 return ExecutionResult(
                     status="running",
                     message="Flow is already running",
@@ -53,77 +114,50 @@ class AutomationExecutor:
                         message="System busy: too many running flows",
                     )
 
-            logger.info(f"Triggering flow {flow.id} in separate process")
+            logger.info(f"Triggering flow {flow_id} in separate process")
 
             execution_id = uuid.uuid4().hex
 
-            # Get the path to the run_automation.py script
-            backend_dir = Path(__file__).resolve().parent.parent.parent.parent
-            script_path = backend_dir / "run_automation.py"
-
-            # Build command arguments
-            cmd_args = [
-                sys.executable,
-                str(script_path),
-                str(flow.id),
-                flow.dsl,
-                "--headless" if flow.headless else "--headed",
-                "--browser",
-                flow.browser_type,
-                "--execution-id",
-                execution_id,
-            ]
-
-            # Add browser path if custom
-            if flow.browser_path:
-                cmd_args.extend(["--browser-path", flow.browser_path])
-            
-            # Add CDP mode flags if enabled
-            if flow.use_cdp_mode:
-                cmd_args.append("--use-cdp-mode")
-                cmd_args.extend(["--cdp-port", str(flow.cdp_port)])
-                if flow.cdp_user_data_dir:
-                    cmd_args.extend(["--cdp-user-data-dir", flow.cdp_user_data_dir])
+            cmd_args = _build_command(flow, execution_id)
 
             # Start process using process manager
-            process = process_manager.start_process(flow.id, cmd_args, str(backend_dir))
+            process = process_manager.start_process(flow_id, cmd_args, _BACKEND_DIR_STR)
 
             # Start background thread to wait for completion and save history
             def wait_for_completion():
                 from datetime import datetime
-                from app.db.session import session_scope
-                from app.models.checkin import CheckinHistory
                 from app.models.automation import FlowStatus
                 
                 started_at = datetime.utcnow()
+                # Durations come from the monotonic clock (immune to wall-clock steps)
+                started_mono = time.monotonic_ns()
                 
                 try:
                     stdout, stderr = process.communicate(timeout=settings.automation_process_timeout_seconds)
                     finished_at = datetime.utcnow()
-                    duration_ms = int((finished_at - started_at).total_seconds() * 1000)
+                    duration_ms = (time.monotonic_ns() - started_mono) // 1_000_000
                     
                     # Parse result
                     screenshot_files: list[str] = []
                     error_types: set[str] = set()
-                    stop_requested = process_manager.was_stop_requested(flow.id)
+                    stop_requested = process_manager.was_stop_requested(flow_id)
 
                     if stop_requested:
                         status = FlowStatus.FAILED
-                        result_payload = json.dumps(
+                        result_payload = orjson.dumps(
                             {
                                 "status": "failed",
                                 "execution_id": execution_id,
                                 "message": "执行被手动停止",
-                            },
-                            ensure_ascii=False,
-                        )
+                            }
+                        ).decode()
                         error_message = "执行被手动停止"
                         error_types.add(ErrorType.MANUAL_STOP.value)
 
                     elif process.returncode == 0:
                         result = extract_json_payload(stdout)
                         if not result:
-                            raise json.JSONDecodeError("No JSON payload", stdout, 0)
+                            raise orjson.JSONDecodeError("No JSON payload", stdout, 0)
 
                         if not result.get("execution_id"):
                             result["execution_id"] = execution_id
@@ -133,7 +167,7 @@ class AutomationExecutor:
                             if result.get("status") == "success"
                             else FlowStatus.FAILED
                         )
-                        result_payload = json.dumps(result, ensure_ascii=False)
+                        result_payload = orjson.dumps(result).decode()
                         
                         # Generate detailed error message from failed steps
                         step_results = result.get("step_results", [])
@@ -147,19 +181,18 @@ class AutomationExecutor:
                                     description = step.get("description", "")
                                     error_text = step.get("error", "Unknown error")
                                     
-                                    # Extract error type (e.g., [TIMEOUT])
+                                    # Extract error type (e.g., [TIMEOUT]) and main message
+                                    match = _STEP_ERROR_RE.match(error_text)
                                     error_type_str = ""
-                                    if error_text.startswith("["):
-                                        error_type_str = error_text.split("]")[0] + "]"
-                                        error_text = error_text[len(error_type_str):].strip()
-                                        error_types.add(error_type_str.strip("[]"))
+                                    if match["type"] is not None:
+                                        error_type_str = f"[{match['type']}]"
+                                        error_types.add(match["type"].strip("["))
                                     else:
                                         # Classify error if no type tag present
                                         classified = classify_error(error_text)
                                         error_types.add(classified.value)
                                     
-                                    # Get first line of error (main message)
-                                    error_main = error_text.split("\n")[0].split("|")[0].strip()
+                                    error_main = match["main"].strip()
                                     
                                     # Build error message with description if available
                                     if description:
@@ -174,9 +207,11 @@ class AutomationExecutor:
                             error_message = None
                         
                         # Extract screenshot paths from step results
-                        paths = [s.get("screenshot_path") for s in step_results if s.get("screenshot_path")]
-                        if paths:
-                            screenshot_files = [Path(p).name for p in paths if p]
+                        screenshot_files = [
+                            os.path.basename(s["screenshot_path"])
+                            for s in step_results
+                            if s.get("screenshot_path")
+                        ]
                     else:
                         status = FlowStatus.FAILED
                         result_payload = None
@@ -186,107 +221,98 @@ class AutomationExecutor:
                                 err_payload["execution_id"] = execution_id
                             error_message = err_payload.get("message") or "Execution failed"
                             error_types.add(classify_error(str(error_message)).value)
-                            result_payload = json.dumps(err_payload, ensure_ascii=False)
+                            result_payload = orjson.dumps(err_payload).decode()
                         else:
                             error_message = stderr or "Execution failed"
                             if stderr:
                                 classified = classify_error(stderr)
                                 error_types.add(classified.value)
-                            result_payload = json.dumps(
+                            result_payload = orjson.dumps(
                                 {
                                     "status": "failed",
                                     "execution_id": execution_id,
                                     "message": error_message,
-                                },
-                                ensure_ascii=False,
-                            )
+                                }
+                            ).decode()
                     
                     # Save to database
-                    with session_scope() as db:
-                        history = CheckinHistory(
-                            flow_id=flow.id,
-                            status=status,
-                            started_at=started_at,
-                            finished_at=finished_at,
-                            duration_ms=duration_ms,
-                            log=stdout if stdout else stderr,
-                            result_payload=result_payload,
-                            error_message=error_message,
-                            screenshot_files=screenshot_files,
-                            error_types=sorted(error_types),
-                        )
-                        db.add(history)
-                        db.commit()
+                    history = CheckinHistory(
+                        flow_id=flow_id,
+                        status=status,
+                        started_at=started_at,
+                        finished_at=finished_at,
+                        duration_ms=duration_ms,
+                        log=stdout if stdout else stderr,
+                        result_payload=result_payload,
+                        error_message=error_message,
+                        screenshot_files=screenshot_files,
+                        error_types=sorted(error_types),
+                    )
+                    _save_history(history)
                     
-                    logger.info(f"Flow {flow.id} execution completed with status {status}")
+                    logger.info(f"Flow {flow_id} execution completed with status {status}")
                 
                 except subprocess.TimeoutExpired:
                     # Process timeout after 5 minutes
-                    logger.error(f"Flow {flow.id} process timeout after {settings.automation_process_timeout_seconds} seconds")
+                    logger.error(f"Flow {flow_id} process timeout after {settings.automation_process_timeout_seconds} seconds")
                     process.kill()
                     finished_at = datetime.utcnow()
-                    duration_ms = int((finished_at - started_at).total_seconds() * 1000)
+                    duration_ms = (time.monotonic_ns() - started_mono) // 1_000_000
                     
                     try:
-                        with session_scope() as db:
-                            history = CheckinHistory(
-                                flow_id=flow.id,
-                                status=FlowStatus.FAILED,
-                                started_at=started_at,
-                                finished_at=finished_at,
-                                duration_ms=duration_ms,
-                                result_payload=json.dumps(
-                                    {
-                                        "status": "failed",
-                                        "execution_id": execution_id,
-                                        "message": "执行进程超时（超过5分钟）",
-                                    },
-                                    ensure_ascii=False,
-                                ),
-                                error_message="执行进程超时（超过5分钟）",
-                                error_types=[ErrorType.PROCESS_TIMEOUT.value],
-                            )
-                            db.add(history)
-                            db.commit()
+                        history = CheckinHistory(
+                            flow_id=flow_id,
+                            status=FlowStatus.FAILED,
+                            started_at=started_at,
+                            finished_at=finished_at,
+                            duration_ms=duration_ms,
+                            result_payload=orjson.dumps(
+                                {
+                                    "status": "failed",
+                                    "execution_id": execution_id,
+                                    "message": "执行进程超时（超过5分钟）",
+                                }
+                            ).decode(),
+                            error_message="执行进程超时（超过5分钟）",
+                            error_types=[ErrorType.PROCESS_TIMEOUT.value],
+                        )
+                        _save_history(history)
                     except Exception as db_error:
                         logger.error(f"Failed to save timeout history: {db_error}")
                     
                 except Exception as e:
-                    logger.error(f"Flow {flow.id} execution error: {e}")
+                    logger.error(f"Flow {flow_id} execution error: {e}")
                     
                     # Classify the exception
                     classified = classify_error(e)
                     
                     # Save error to database
                     try:
-                        with session_scope() as db:
-                            history = CheckinHistory(
-                                flow_id=flow.id,
-                                status=FlowStatus.FAILED,
-                                started_at=started_at,
-                                finished_at=datetime.utcnow(),
-                                duration_ms=int((datetime.utcnow() - started_at).total_seconds() * 1000),
-                                result_payload=json.dumps(
-                                    {
-                                        "status": "failed",
-                                        "execution_id": execution_id,
-                                        "message": str(e),
-                                    },
-                                    ensure_ascii=False,
-                                ),
-                                error_message=str(e),
-                                error_types=[classified.value],
-                            )
-                            db.add(history)
-                            db.commit()
+                        history = CheckinHistory(
+                            flow_id=flow_id,
+                            status=FlowStatus.FAILED,
+                            started_at=started_at,
+                            finished_at=datetime.utcnow(),
+                            duration_ms=(time.monotonic_ns() - started_mono) // 1_000_000,
+                            result_payload=orjson.dumps(
+                                {
+                                    "status": "failed",
+                                    "execution_id": execution_id,
+                                    "message": str(e),
+                                }
+                            ).decode(),
+                            error_message=str(e),
+                            error_types=[classified.value],
+                        )
+                        _save_history(history)
                     except Exception as db_error:
                         logger.error(f"Failed to save error history: {db_error}")
                 
                 finally:
-                    process_manager.clear_stop_request(flow.id)
+                    process_manager.clear_stop_request(flow_id)
                     # Clean up from process manager
-                    if process_manager.is_running(flow.id):
-                        process_manager.stop_process(flow.id)
+                    if process_manager.is_running(flow_id):
+                        process_manager.stop_process(flow_id)
 
             thread = threading.Thread(target=wait_for_completion, daemon=True)
             thread.start()
@@ -302,8 +328,8 @@ class AutomationExecutor:
             return ExecutionResult(status="running", message=str(e))
 
         except Exception as e:
-            logger.error(f"Execution error for flow {flow.id}: {e}", exc_info=True)
-            process_manager.stop_process(flow.id)
+            logger.error(f"Execution error for flow {flow_id}: {e}", exc_info=True)
+            process_manager.stop_process(flow_id)
             return ExecutionResult(status="failed", message=f"Execution error: {e}")
 
     def stop(self, flow: AutomationFlow) -> ExecutionResult:
@@ -64,16 +64,24 @@ async def handle_screenshot(
     
     Note: screenshot_dir should be passed from executor context.
     """
-    filename = params.get("path", f"flow_{flow_id}_step_{index}.png")
     full_page = params.get("full_page", False)
+    # Viewport shots default to JPEG: a single captureScreenshot call and a far smaller
+    # file than PNG. Full-page shots keep PNG so long pages stay legible.
+    default_ext = "png" if full_page else "jpg"
+    filename = params.get("path", f"flow_{flow_id}_step_{index}.{default_ext}")
 
     if screenshot_dir:
         screenshot_path = screenshot_dir / filename
     else:
         screenshot_path = Path("data/screenshots") / filename
         screenshot_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    await page.screenshot(path=str(screenshot_path), full_page=full_page)
+
+    # The image type follows the file extension; quality only applies to JPEG
+    options: dict[str, Any] = {}
+    if screenshot_path.suffix.lower() in (".jpg", ".jpeg"):
+        options["quality"] = params.get("quality", 75)
+
+    await page.screenshot(path=str(screenshot_path), full_page=full_page, **options)
 
     return {
         "message": f"Screenshot saved to {filename}",
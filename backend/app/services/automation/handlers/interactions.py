@@ -21,10 +21,8 @@ async def handle_input(
     """Handle input step."""
     selector = params["selector"]
     value = resolve_variables(params["value"], variables)
-    clear = params.get("clear", True)
 
-    if clear:
-        await page.fill(selector, "")
+    # fill() replaces the current value itself, so "clear" needs no separate round-trip
     await page.fill(selector, str(value))
     return {"message": f"Input '{value}' into {selector}"}
 
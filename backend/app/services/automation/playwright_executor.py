@@ -3,23 +3,76 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
-from patchright.async_api import Browser, Page, async_playwright
+from patchright.async_api import Browser, Page, Route, async_playwright
 
 from app.services.automation.dsl_parser import ParsedStep, StepType
 from app.services.automation.error_types import classify_error, ErrorType
 from app.services.automation.cloudflare_handler import CloudflareHandler
-from app.services.automation.handlers import HANDLER_REGISTRY
+from app.services.automation.handlers import HANDLER_REGISTRY, handle_screenshot
 from app.services.automation.variable_resolver import resolve_variables
 
 logger = logging.getLogger(__name__)
 
+# Requests aborted when resource blocking is enabled. Stylesheets stay allowed: without them
+# layout, visibility and click targets change and selector steps start failing.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+ANALYTICS_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "hm.baidu.com",
+    "cnzz.com",
+    "connect.facebook.net",
+    "clarity.ms",
+)
+
+
+# Zeroes CSS animations/transitions on every document so auto-waits don't sit through them
+_DISABLE_ANIMATIONS_JS = """
+(() => {
+    const css = "*, *::before, *::after {"
+        + "animation-duration: 0s !important; animation-delay: 0s !important;"
+        + "transition-duration: 0s !important; transition-delay: 0s !important; }";
+    const inject = () => {
+        const style = document.createElement("style");
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.documentElement) inject();
+    else document.addEventListener("DOMContentLoaded", inject, { once: true });
+})();
+"""
+
+
+async def _block_heavy_requests(route: Route) -> None:
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+        host in request.url for host in ANALYTICS_HOSTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _close_quietly(resource: Any, label: str) -> None:
+    """Close a Playwright context/browser if present, logging instead of raising."""
+    if not resource:
+        return
+    try:
+        logger.info(f"   Closing {label}...")
+        await resource.close()
+        logger.info(f"   ✅ {label[0].upper()}{label[1:]} closed")
+    except Exception as e:
+        logger.warning(f"   ⚠️  Error closing {label}: {e}")
 
-@dataclass
+
+@dataclass(slots=True)
 class StepResult:
     """Result of executing a single step."""
 
@@ -34,7 +87,7 @@ class StepResult:
     description: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     """Result of executing an entire flow."""
 
@@ -62,6 +115,9 @@ class PlaywrightExecutor:
         storage_state_dir: str = "data/storage_states",
         cf_protection: bool = True,  # Enable Cloudflare auto-handling
         max_concurrent_executions: int | None = None,
+        block_resources: bool = False,  # Abort images/fonts/media and analytics requests
+        disable_animations: bool = False,  # Zero CSS animation/transition durations
+        persist_storage_state: bool = False,  # Carry cookies/localStorage across runs of a flow
     ):
         self.headless = headless
         self.browser_type = browser_type
@@ -70,6 +126,9 @@ class PlaywrightExecutor:
         self.screenshot_dir.mkdir(parents=True, exist_ok=True)
         self.storage_state_dir = Path(storage_state_dir)
         self.storage_state_dir.mkdir(parents=True, exist_ok=True)
+        self.block_resources = block_resources
+        self.disable_animations = disable_animations
+        self.persist_storage_state = persist_storage_state
         self._semaphore: asyncio.Semaphore | None = (
             asyncio.Semaphore(max_concurrent_executions)
             if max_concurrent_executions and max_concurrent_executions > 0
@@ -79,11 +138,49 @@ class PlaywrightExecutor:
         # Cloudflare challenge handler
         self.cf_handler = CloudflareHandler(
             enabled=cf_protection,
-            check_probability=0.3,  # 30% random check between steps
             max_wait_time=45000,    # 45 seconds max wait
             check_after_navigate=True,  # Always check after navigation
         )
 
+        # Step dispatch tables, built once instead of on every step.
+        # Control flow and screenshot stay instance methods because they need
+        # _execute_child_step or screenshot_dir; everything else comes from the registry.
+        self._step_handlers = {
+            **HANDLER_REGISTRY,
+            StepType.SCREENSHOT: self._handle_screenshot,
+            StepType.LOOP: self._handle_loop,
+            StepType.LOOP_ARRAY: self._handle_loop_array,
+            StepType.IF_ELSE: self._handle_if_else,
+        }
+        self._child_step_handlers = {
+            StepType.NAVIGATE: self._handle_navigate,
+            StepType.CLICK: self._handle_click,
+            StepType.INPUT: self._handle_input,
+            StepType.WAIT_FOR: self._handle_wait_for,
+            StepType.WAIT_TIME: self._handle_wait_time,
+            StepType.EXTRACT: self._handle_extract,
+            StepType.SCREENSHOT: self._handle_screenshot,
+            StepType.SELECT: self._handle_select,
+            StepType.CHECKBOX: self._handle_checkbox,
+            StepType.SCROLL: self._handle_scroll,
+            StepType.HOVER: self._handle_hover,
+            StepType.KEYBOARD: self._handle_keyboard,
+            StepType.SET_VARIABLE: self._handle_set_variable,
+            StepType.IF_EXISTS: self._handle_if_exists,
+            StepType.ASSERT_TEXT: self._handle_assert_text,
+            StepType.ASSERT_VISIBLE: self._handle_assert_visible,
+            StepType.EXTRACT_ALL: self._handle_extract_all,
+            StepType.RANDOM_DELAY: self._handle_random_delay,
+            StepType.TRY_CLICK: self._handle_try_click,
+            StepType.EVAL_JS: self._handle_eval_js,
+            StepType.NEW_TAB: self._handle_new_tab,
+            StepType.SWITCH_TAB: self._handle_switch_tab,
+            StepType.CLOSE_TAB: self._handle_close_tab,
+            StepType.LOOP: self._handle_loop,
+            StepType.LOOP_ARRAY: self._handle_loop_array,
+            StepType.IF_ELSE: self._handle_if_else,
+        }
+
     async def execute(
         self,
         flow_id: int,
@@ -133,6 +230,7 @@ class PlaywrightExecutor:
         cdp_user_data_dir: Optional[str],
     ) -> ExecutionResult:
         started_at = datetime.utcnow()
+        started_ns = time.monotonic_ns()
         step_results = []
         variables: dict[str, Any] = {}
         steps_failed = 0
@@ -157,7 +255,11 @@ class PlaywrightExecutor:
             # MODE 1: CDP Mode (auto-start browser with copied profile if needed)
             browser_manager = None
             if use_cdp_mode:
-                from app.services.automation.browser_launcher import get_browser_manager, is_cdp_ready
+                from app.services.automation.browser_launcher import (
+                    get_browser_manager,
+                    is_cdp_ready,
+                    wait_for_cdp_ready,
+                )
                 
                 logger.info(f"🎯 CDP Mode enabled")
                 logger.info(f"   Port: {cdp_port}")
@@ -183,7 +285,7 @@ class PlaywrightExecutor:
                     
                     # Auto-start browser with copied/dedicated profile
                     browser_manager = get_browser_manager()
-                    success = browser_manager.start_browser(
+                    success = await browser_manager.start_browser_async(
                         browser_type=self.browser_type,
                         port=cdp_port,
                         custom_path=self.browser_path,
@@ -204,12 +306,8 @@ class PlaywrightExecutor:
                     cdp_endpoint = f"http://localhost:{cdp_port}"
                     
                     # Final verification that CDP is ready
-                    if not is_cdp_ready(cdp_port):
-                        logger.warning("CDP not ready yet, waiting additional 5s...")
-                        import asyncio
-                        await asyncio.sleep(5)
-                        if not is_cdp_ready(cdp_port):
-                            raise RuntimeError(f"CDP interface on port {cdp_port} is not responding")
+                    if not await wait_for_cdp_ready(cdp_port, max_wait=5.0):
+                        raise RuntimeError(f"CDP interface on port {cdp_port} is not responding")
                     
                     logger.info(f"Connecting to CDP endpoint: {cdp_endpoint}")
                     
@@ -268,26 +366,43 @@ class PlaywrightExecutor:
                     "ignore_https_errors": True,
                 }
 
+                # Restore the previous run's cookies/localStorage so the flow skips re-login
+                storage_state_path = self._storage_state_path(flow_id)
+                if self.persist_storage_state and storage_state_path.exists():
+                    context_options["storage_state"] = str(storage_state_path)
+                    logger.info(f"Restoring storage state from {storage_state_path}")
+
                 context = await browser.new_context(**context_options)
+                # Only for our own fresh context; CDP mode shares the user's browser
+                if self.block_resources:
+                    await context.route("**/*", _block_heavy_requests)
+                if self.disable_animations:
+                    await context.add_init_script(script=_DISABLE_ANIMATIONS_JS)
 
                 page = await context.new_page()
             
             # Ensure we have a page
             if not page:
                 page = await context.new_page()
+            self.cf_handler.attach(page)
 
             try:
                 for idx, step in enumerate(steps):
+                    # Lazy %-args: INFO is usually filtered, so skip formatting per step
                     logger.info(
-                        f"[flow={flow_id} step={idx + 1}/{len(steps)} type={step.type.value}] Executing"
+                        "[flow=%s step=%d/%d type=%s] Executing",
+                        flow_id, idx + 1, len(steps), step.type.value,
                     )
-                    step_start = datetime.utcnow()
+                    step_start_ns = time.monotonic_ns()
 
-                    # Pre-step CF check (random probability)
+                    # Pre-step CF check (after a navigation, or the periodic safety net)
                     if await self.cf_handler.should_check(after_navigate=False):
                         cf_result = await self.cf_handler.check_and_handle(page)
                         if cf_result["detected"]:
-                            logger.info(f"🛡️ Pre-step CF check: {cf_result['type']} handled={cf_result['handled']}")
+                            logger.info(
+                                "🛡️ Pre-step CF check: %s handled=%s",
+                                cf_result["type"], cf_result["handled"],
+                            )
 
                     try:
                         result = await self._execute_step(
@@ -300,9 +415,14 @@ class PlaywrightExecutor:
 
                         # Post-navigate CF check (always after navigation)
                         if result.success and step.type == StepType.NAVIGATE:
-                            cf_result = await self.cf_handler.check_and_handle(page)
+                            cf_result = await self.cf_handler.check_and_handle(
+                                page, after_navigate=True
+                            )
                             if cf_result["detected"]:
-                                logger.info(f"🛡️ Post-navigate CF: {cf_result['type']} handled={cf_result['handled']} ({cf_result['duration_ms']}ms)")
+                                logger.info(
+                                    "🛡️ Post-navigate CF: %s handled=%s (%sms)",
+                                    cf_result["type"], cf_result["handled"], cf_result["duration_ms"],
+                                )
                                 if not cf_result["handled"]:
                                     logger.warning("⚠️ CF challenge not resolved, continuing anyway...")
 
@@ -315,9 +435,7 @@ class PlaywrightExecutor:
                             f"[flow={flow_id} step={idx + 1}/{len(steps)} type={step.type.value}] Error: {e}",
                             exc_info=True,
                         )
-                        step_duration = int(
-                            (datetime.utcnow() - step_start).total_seconds() * 1000
-                        )
+                        step_duration = (time.monotonic_ns() - step_start_ns) // 1_000_000
                         step_results.append(
                             StepResult(
                                 step_index=idx,
@@ -335,23 +453,23 @@ class PlaywrightExecutor:
                 logger.info("=" * 70)
                 logger.info("🧹 Cleanup: Closing browser and context...")
                 
-                try:
-                    # Always close context first (if exists)
-                    if context:
-                        logger.info("   Closing context...")
-                        await context.close()
-                        logger.info("   ✅ Context closed")
-                except Exception as e:
-                    logger.warning(f"   ⚠️  Error closing context: {e}")
-                
-                try:
-                    # Always close browser connection (disconnect from CDP or close regular browser)
-                    if browser:
-                        logger.info("   Closing browser connection...")
-                        await browser.close()
-                        logger.info("   ✅ Browser connection closed")
-                except Exception as e:
-                    logger.warning(f"   ⚠️  Error closing browser: {e}")
+                # Persist session state of a fully successful run (non-CDP mode only;
+                # CDP mode keeps state in the user's profile already)
+                if (
+                    self.persist_storage_state
+                    and context
+                    and not use_cdp_mode
+                    and steps_failed == 0
+                ):
+                    try:
+                        await context.storage_state(path=str(self._storage_state_path(flow_id)))
+                        logger.info("   ✅ Storage state saved")
+                    except Exception as e:
+                        logger.warning(f"   ⚠️  Error saving storage state: {e}")
+
+                # Context first, then the browser (disconnects in CDP mode)
+                await _close_quietly(context, "context")
+                await _close_quietly(browser, "browser connection")
                 
                 # Inform user about CDP mode behavior
                 if use_cdp_mode:
@@ -366,7 +484,7 @@ class PlaywrightExecutor:
                 logger.info("=" * 70)
 
         completed_at = datetime.utcnow()
-        total_duration = int((completed_at - started_at).total_seconds() * 1000)
+        total_duration = (time.monotonic_ns() - started_ns) // 1_000_000
 
         status = "success" if steps_failed == 0 else "failed"
         if 0 < steps_failed < len(steps):
@@ -395,25 +513,15 @@ class PlaywrightExecutor:
         context=None,
     ) -> StepResult:
         """Execute a single step."""
-        start_time = datetime.utcnow()
-
-        # Control flow and special handlers that need self access
-        # These stay as instance methods because they need _execute_child_step or screenshot_dir
-        instance_handlers = {
-            StepType.SCREENSHOT: self._handle_screenshot,  # needs self.screenshot_dir
-            StepType.LOOP: self._handle_loop,              # needs self._execute_child_step
-            StepType.LOOP_ARRAY: self._handle_loop_array,  # needs self._execute_child_step
-            StepType.IF_ELSE: self._handle_if_else,        # needs self._execute_child_step
-        }
+        start_ns = time.monotonic_ns()
 
-        # Try instance handler first, then fall back to registry
-        handler = instance_handlers.get(step.type) or HANDLER_REGISTRY.get(step.type)
+        handler = self._step_handlers.get(step.type)
         if not handler:
             raise ValueError(f"No handler for step type: {step.type}")
 
         try:
             result_data = await handler(page, step.params, variables, flow_id, index)
-            duration = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+            duration = (time.monotonic_ns() - start_ns) // 1_000_000
 
             return StepResult(
                 step_index=index,
@@ -427,25 +535,30 @@ class PlaywrightExecutor:
             )
 
         except Exception as e:
-            import traceback
-
-            duration = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+            duration = (time.monotonic_ns() - start_ns) // 1_000_000
+
+            # Capture error screenshot while the error detail is being gathered; it is
+            # awaited before returning so the next step never runs mid-capture
+            error_filename = f"error_flow_{flow_id}_step_{index}_{int(time.time())}.png"
+            error_screenshot_path = self.screenshot_dir / error_filename
+            screenshot_task = asyncio.create_task(
+                page.screenshot(path=str(error_screenshot_path), full_page=True)
+            )
 
-            # Capture error screenshot
-            error_screenshot_path = None
             try:
-                error_filename = f"error_flow_{flow_id}_step_{index}_{int(start_time.timestamp())}.png"
-                error_screenshot_path = self.screenshot_dir / error_filename
-                await page.screenshot(path=str(error_screenshot_path), full_page=True)
-                logger.info(f"Error screenshot saved: {error_screenshot_path}")
-            except Exception as screenshot_error:
-                logger.warning(f"Failed to capture error screenshot: {screenshot_error}")
+                # Classify error type
+                error_type = self._classify_error(e)
 
-            # Classify error type
-            error_type = self._classify_error(e)
-
-            # Get detailed error message
-            error_detail = await self._format_error_detail(e, step, page)
+                # Get detailed error message
+                error_detail = await self._format_error_detail(e, step, page)
+            finally:
+                # Settle the capture even if gathering the detail raised
+                try:
+                    await screenshot_task
+                    logger.info(f"Error screenshot saved: {error_screenshot_path}")
+                except Exception as screenshot_error:
+                    error_screenshot_path = None
+                    logger.warning(f"Failed to capture error screenshot: {screenshot_error}")
 
             return StepResult(
                 step_index=index,
@@ -481,10 +594,8 @@ class PlaywrightExecutor:
         """Handle input step."""
         selector = params["selector"]
         value = self._resolve_variables(params["value"], variables)
-        clear = params.get("clear", True)
 
-        if clear:
-            await page.fill(selector, "")
+        # fill() replaces the current value itself, so "clear" needs no separate round-trip
         await page.fill(selector, str(value))
         return {"message": f"Input '{value}' into {selector}"}
 
@@ -528,16 +639,9 @@ class PlaywrightExecutor:
         self, page: Page, params: dict, variables: dict, flow_id: int, index: int
     ) -> dict:
         """Handle screenshot step."""
-        filename = params.get("path", f"flow_{flow_id}_step_{index}.png")
-        full_page = params.get("full_page", False)
-
-        screenshot_path = self.screenshot_dir / filename
-        await page.screenshot(path=str(screenshot_path), full_page=full_page)
-
-        return {
-            "message": f"Screenshot saved to {filename}",
-            "screenshot_path": str(screenshot_path),
-        }
+        return await handle_screenshot(
+            page, params, variables, flow_id, index, screenshot_dir=self.screenshot_dir
+        )
 
     async def _handle_select(
         self, page: Page, params: dict, variables: dict, flow_id: int, index: int
@@ -950,46 +1054,15 @@ class PlaywrightExecutor:
         self, page: Page, step_data: dict, variables: dict, flow_id: int
     ) -> dict:
         """Execute a child step from nested DSL structure."""
-        from app.services.automation.dsl_parser import ParsedStep, StepType
-        
         step_type_str = step_data.get("type", "")
-        if step_type_str not in [e.value for e in StepType]:
+        try:
+            step_type = StepType(step_type_str)
+        except ValueError:
             return {"success": False, "error": f"Unknown step type: {step_type_str}"}
         
-        step_type = StepType(step_type_str)
         params = {k: v for k, v in step_data.items() if k not in ["type", "description"]}
         
-        # Get the appropriate handler
-        handlers = {
-            StepType.NAVIGATE: self._handle_navigate,
-            StepType.CLICK: self._handle_click,
-            StepType.INPUT: self._handle_input,
-            StepType.WAIT_FOR: self._handle_wait_for,
-            StepType.WAIT_TIME: self._handle_wait_time,
-            StepType.EXTRACT: self._handle_extract,
-            StepType.SCREENSHOT: self._handle_screenshot,
-            StepType.SELECT: self._handle_select,
-            StepType.CHECKBOX: self._handle_checkbox,
-            StepType.SCROLL: self._handle_scroll,
-            StepType.HOVER: self._handle_hover,
-            StepType.KEYBOARD: self._handle_keyboard,
-            StepType.SET_VARIABLE: self._handle_set_variable,
-            StepType.IF_EXISTS: self._handle_if_exists,
-            StepType.ASSERT_TEXT: self._handle_assert_text,
-            StepType.ASSERT_VISIBLE: self._handle_assert_visible,
-            StepType.EXTRACT_ALL: self._handle_extract_all,
-            StepType.RANDOM_DELAY: self._handle_random_delay,
-            StepType.TRY_CLICK: self._handle_try_click,
-            StepType.EVAL_JS: self._handle_eval_js,
-            StepType.NEW_TAB: self._handle_new_tab,
-            StepType.SWITCH_TAB: self._handle_switch_tab,
-            StepType.CLOSE_TAB: self._handle_close_tab,
-            StepType.LOOP: self._handle_loop,
-            StepType.LOOP_ARRAY: self._handle_loop_array,
-            StepType.IF_ELSE: self._handle_if_else,
-        }
-        
-        handler = handlers.get(step_type)
+        handler = self._child_step_handlers.get(step_type)
         if not handler:
             return {"success": False, "error": f"No handler for: {step_type_str}"}
         
@@ -1000,6 +1073,10 @@ class PlaywrightExecutor:
             logger.error(f"Child step error ({step_type_str}): {e}")
             return {"success": False, "error": str(e)}
 
+    def _storage_state_path(self, flow_id: int) -> Path:
+        """Per-flow storage state file used when persist_storage_state is enabled."""
+        return self.storage_state_dir / f"flow_{flow_id}.json"
+
     def _resolve_variables(self, value: str, variables: dict) -> str:
         """Resolve variable placeholders in string values."""
         return resolve_variables(value, variables, stringify_non_str=False)
@@ -1033,15 +1110,11 @@ class PlaywrightExecutor:
                 count = await page.locator(selector).count()
                 if count == 0:
                     details.append("⚠️ Element not found")
-                    # Suggest similar selectors
-                    try:
-                        page_content = await page.content()
-                        if selector.startswith("#"):
-                            details.append("💡 Tip: Check if element ID is correct")
-                        elif selector.startswith("."):
-                            details.append("💡 Tip: Check if CSS class exists")
-                    except:
-                        pass
+                    # Hint based on the selector kind (no need to serialize the DOM)
+                    if selector.startswith("#"):
+                        details.append("💡 Tip: Check if element ID is correct")
+                    elif selector.startswith("."):
+                        details.append("💡 Tip: Check if CSS class exists")
                 else:
                     details.append(f"✓ Found {count} element(s)")
             except:
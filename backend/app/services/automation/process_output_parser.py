@@ -5,15 +5,16 @@ Goal: improve result stability even when stdout/stderr contains noisy logs.
 
 from __future__ import annotations
 
-import json
 from typing import Any
 
+import orjson
+
 
 def extract_json_payload(output: str) -> dict[str, Any] | None:
     """Extract a JSON object payload from process output.
 
     Strategy (best-effort):
-    1) Try json.loads on whole output
+    1) Try parsing the whole output
     2) Try parsing line-by-line from bottom (common pattern: last line is JSON)
     3) Try parsing from last '{' occurrences (handles noisy prefixes)
 
@@ -28,13 +29,17 @@ def extract_json_payload(output: str) -> dict[str, Any] | None:
     if not text:
         return None
 
+    # Only an object can qualify, so skip parses that are bound to raise
+    ends_with_object = text.endswith("}")
+
     # 1) Direct parse
-    try:
-        value = json.loads(text)
-        if isinstance(value, dict):
-            return value
-    except Exception:
-        pass
+    if ends_with_object and text.startswith("{"):
+        try:
+            value = orjson.loads(text)
+            if isinstance(value, dict):
+                return value
+        except Exception:
+            pass
 
     # 2) Last-line parse (reverse)
     lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
@@ -42,18 +47,20 @@ def extract_json_payload(output: str) -> dict[str, Any] | None:
         if not (ln.startswith("{") and ln.endswith("}")):
             continue
         try:
-            value = json.loads(ln)
+            value = orjson.loads(ln)
             if isinstance(value, dict):
                 return value
         except Exception:
             continue
 
-    # 3) Try from last '{' positions
+    # 3) Try from last '{' positions (every candidate ends where the text ends)
+    if not ends_with_object:
+        return None
     idx = text.rfind("{")
     while idx != -1:
         candidate = text[idx:].strip()
         try:
-            value = json.loads(candidate)
+            value = orjson.loads(candidate)
             if isinstance(value, dict):
                 return value
         except Exception:
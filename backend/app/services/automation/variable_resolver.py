@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import re
 from typing import Any, Mapping
 
+# One pass over the template for both syntaxes; group 1 is {{var}}, group 2 is ${var}
+_PLACEHOLDER_RE = re.compile(r"\{\{([^{}]+)\}\}|\$\{([^{}]+)\}")
+
 
 def resolve_variables(
     value: Any,
@@ -29,10 +33,14 @@ def resolve_variables(
     if not isinstance(value, str):
         return str(value) if stringify_non_str else value
 
-    result = value
-    for var_name, var_value in variables.items():
-        # Keep behavior stable across code paths by supporting both syntaxes
-        result = result.replace(f"{{{{{var_name}}}}}", str(var_value))
-        result = result.replace(f"${{{var_name}}}", str(var_value))
+    if not variables or "{" not in value:
+        return value
+
+    def _substitute(match: re.Match[str]) -> str:
+        name = match.group(1) or match.group(2)
+        if name in variables:
+            return str(variables[name])
+        # Unknown placeholders (e.g. JS template literals) are left untouched
+        return match.group(0)
 
-    return result
+    return _PLACEHOLDER_RE.sub(_substitute, value)
@@ -1,15 +1,15 @@
-import json
-
 from app.models.automation import AutomationFlow
 from app.models.checkin import CheckinHistory
+from app.models.site import Site
 from app.schemas.flow import AutomationFlowRead, CheckinHistoryRead
+from app.schemas.site import CategoryRead, SiteRead, TagRead
 from app.services.automation.history_observability import compute_observability_fields
 
 
+# Rows come from our own tables, so the Read schemas are built with model_construct()
+# instead of re-running field validation for every item of a list response.
 def flow_to_schema(flow: AutomationFlow) -> AutomationFlowRead:
-    # Parse DSL JSON string to dict
-    dsl = json.loads(flow.dsl) if isinstance(flow.dsl, str) else flow.dsl
-    return AutomationFlowRead(
+    return AutomationFlowRead.model_construct(
         id=flow.id,
         site_id=flow.site_id,
         name=flow.name,
@@ -22,27 +22,48 @@ def flow_to_schema(flow: AutomationFlow) -> AutomationFlowRead:
         use_cdp_mode=flow.use_cdp_mode,
         cdp_port=flow.cdp_port,
         cdp_user_data_dir=flow.cdp_user_data_dir,
-        dsl=dsl,
+        block_resources=flow.block_resources,
+        disable_animations=flow.disable_animations,
+        persist_storage_state=flow.persist_storage_state,
+        dsl=flow.dsl,
         last_status=flow.last_status,
         created_at=flow.created_at,
         updated_at=flow.updated_at,
     )
 
 
-def history_to_schema(history: CheckinHistory) -> CheckinHistoryRead:
+def site_to_schema(
+    site: Site, category: CategoryRead | None, tags: list[TagRead]
+) -> SiteRead:
+    return SiteRead.model_construct(
+        id=site.id,
+        name=site.name,
+        url=site.url,
+        description=site.description,
+        category_id=site.category_id,
+        is_active=site.is_active,
+        sort_order=site.sort_order,
+        created_at=site.created_at,
+        updated_at=site.updated_at,
+        category=category,
+        tags=tags,
+    )
+
+
+def history_to_schema(history: CheckinHistory, *, include_log: bool = True) -> CheckinHistoryRead:
     execution_id, primary_error_type, failed_step_summary = compute_observability_fields(
         result_payload=history.result_payload,
         error_types=history.error_types or [],
         error_message=history.error_message,
     )
-    return CheckinHistoryRead(
+    return CheckinHistoryRead.model_construct(
         id=history.id,
         flow_id=history.flow_id,
         status=history.status,
         started_at=history.started_at,
         finished_at=history.finished_at,
         duration_ms=history.duration_ms,
-        log=history.log,
+        log=history.log if include_log else None,
         result_payload=history.result_payload,
         error_message=history.error_message,
         screenshot_files=history.screenshot_files or [],
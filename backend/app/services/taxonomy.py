@@ -0,0 +1,55 @@
+"""Process-local cache of categories and tags used to build site list responses.
+
+Both tables are tiny and rarely written, so site lists stitch them in from here
+instead of eager-loading them per page. Writes in this process call
+``invalidate()``; the TTL bounds staleness from other worker processes.
+A read that overlaps an ``invalidate()`` does not store its (possibly stale)
+result, since the generation it started under has moved on.
+"""
+from __future__ import annotations
+
+from cachetools import TTLCache
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud import catalog as catalog_crud
+from app.schemas.site import CategoryRead, TagRead
+
+_CACHE_TTL_SECONDS = 60
+
+_cache: TTLCache = TTLCache(maxsize=2, ttl=_CACHE_TTL_SECONDS)
+# Bumped by invalidate(); fills only land if it is unchanged since their query started
+_generation = 0
+
+
+async def get_categories(session: AsyncSession) -> dict[int, CategoryRead]:
+    categories = _cache.get("categories")
+    if categories is None:
+        generation = _generation
+        categories = {
+            category.id: CategoryRead.model_construct(
+                id=category.id, name=category.name, description=category.description
+            )
+            for category in await catalog_crud.list_categories(session)
+        }
+        if generation == _generation:
+            _cache["categories"] = categories
+    return categories
+
+
+async def get_tags(session: AsyncSession) -> dict[int, TagRead]:
+    tags = _cache.get("tags")
+    if tags is None:
+        generation = _generation
+        tags = {
+            tag.id: TagRead.model_construct(id=tag.id, name=tag.name, color=tag.color)
+            for tag in await catalog_crud.list_tags(session)
+        }
+        if generation == _generation:
+            _cache["tags"] = tags
+    return tags
+
+
+def invalidate() -> None:
+    global _generation
+    _generation += 1
+    _cache.clear()
@@ -85,6 +85,12 @@ def main():
     parser.add_argument("--cdp-user-data-dir", type=str, default=None,
                        help="Custom browser user data directory (uses default profile if not specified)")
     parser.add_argument("--execution-id", type=str, default=None)
+    parser.add_argument("--block-resources", action="store_true", default=False,
+                       help="Abort image/font/media and analytics requests (non-CDP mode)")
+    parser.add_argument("--disable-animations", action="store_true", default=False,
+                       help="Zero CSS animation/transition durations (non-CDP mode)")
+    parser.add_argument("--persist-storage-state", action="store_true", default=False,
+                       help="Reuse cookies/localStorage from this flow's last successful run (non-CDP mode)")
     
     args = parser.parse_args()
 
@@ -99,6 +105,9 @@ def main():
         pw_executor.headless = headless
         pw_executor.browser_type = args.browser
         pw_executor.browser_path = args.browser_path
+        pw_executor.block_resources = args.block_resources
+        pw_executor.disable_animations = args.disable_animations
+        pw_executor.persist_storage_state = args.persist_storage_state
 
         # Create new event loop with ProactorEventLoop
         loop = asyncio.new_event_loop()
@@ -1,50 +1,60 @@
 """Pytest configuration and fixtures."""
-from typing import Generator
+import asyncio
+from typing import Any, AsyncGenerator, Callable, Coroutine, Generator
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel, create_engine
-from sqlmodel.pool import StaticPool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.router import api_router
 from app.api.deps import get_db
 
 
-@pytest.fixture(name="engine")
-def engine_fixture():
-    """Create a test database engine."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
+@pytest.fixture(name="run")
+def run_fixture() -> Generator[Callable[[Coroutine[Any, Any, Any]], Any], None, None]:
+    """Run coroutines to completion on a private event loop."""
+    # asyncio.run() would clear the thread's current loop, which other tests still rely on
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture(name="db_path")
+def db_path_fixture(tmp_path) -> str:
+    """Create a file-backed test database shared by the sync and async engines."""
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}")
     SQLModel.metadata.create_all(engine)
-    return engine
+    engine.dispose()
+    return str(path)
 
 
-@pytest.fixture(name="session")
-def session_fixture(engine) -> Generator[Session, None, None]:
-    """Create a test database session."""
-    with Session(engine) as session:
-        yield session
+@pytest.fixture(name="session_factory")
+def session_factory_fixture(db_path: str):
+    """Create an async session factory bound to the test database."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
 @pytest.fixture(name="client")
-def client_fixture(session: Session) -> Generator[TestClient, None, None]:
+def client_fixture(session_factory) -> Generator[TestClient, None, None]:
     """Create a minimal test app without static file mounts."""
     # Create a fresh app for testing (without static files that interfere)
     test_app = FastAPI()
     test_app.include_router(api_router, prefix="/api")
-    
+
     @test_app.get("/healthz")
     def healthcheck():
         return {"status": "ok"}
-    
-    def get_db_override():
-        yield session
+
+    async def get_db_override() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            yield session
 
     test_app.dependency_overrides[get_db] = get_db_override
-    
+
     with TestClient(test_app) as client:
         yield client
@@ -0,0 +1,82 @@
+"""Tests for the verified-token cache in get_current_user."""
+from datetime import timedelta
+import time
+
+from cachetools import TLRUCache
+import jwt
+import pytest
+
+from app.api import deps
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.user import User
+
+
+class _Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(name="clock")
+def clock_fixture(monkeypatch) -> _Clock:
+    """Swap in an empty token cache driven by a controllable clock."""
+    clock = _Clock(time.time())
+    cache = TLRUCache(maxsize=16, ttu=deps._token_cache.ttu, timer=clock)
+    monkeypatch.setattr(deps, "_token_cache", cache)
+    return clock
+
+
+@pytest.fixture(name="lookups")
+def lookups_fixture(monkeypatch) -> list[str]:
+    """Record every user-by-email lookup made by get_current_user."""
+    lookups: list[str] = []
+
+    async def get_by_email(_db, email: str) -> User:
+        lookups.append(email)
+        return User(id=1, email=email, hashed_password="not-used")
+
+    monkeypatch.setattr(deps, "get_by_email", get_by_email)
+    return lookups
+
+
+def _token_exp(token: str) -> int:
+    return jwt.decode(token, settings.secret_key, algorithms=["HS256"])["exp"]
+
+
+def test_cached_token_skips_user_lookup(run, clock: _Clock, lookups: list[str]):
+    """Test that a second request with the same token is served from the cache."""
+    token = create_access_token("admin@example.com")
+
+    first = run(deps.get_current_user(token=token, db=None))
+    second = run(deps.get_current_user(token=token, db=None))
+
+    assert second is first
+    assert lookups == ["admin@example.com"]
+
+
+def test_cache_entry_expires_after_ttl(run, clock: _Clock, lookups: list[str]):
+    """Test that a cached token is looked up again once the cache TTL has passed."""
+    token = create_access_token("admin@example.com")
+
+    run(deps.get_current_user(token=token, db=None))
+    clock.now += deps._TOKEN_CACHE_TTL_SECONDS + 1
+    run(deps.get_current_user(token=token, db=None))
+
+    assert len(lookups) == 2
+
+
+def test_near_expiry_token_is_not_served_past_its_exp(run, clock: _Clock, lookups: list[str]):
+    """Test that a cache entry never outlives the token's own exp claim."""
+    token = create_access_token("admin@example.com", timedelta(minutes=5))
+    exp = _token_exp(token)
+
+    # Cached 5s before exp: the entry must expire at exp, not 30s later
+    clock.now = exp - 5
+    run(deps.get_current_user(token=token, db=None))
+    clock.now = exp + 1
+    run(deps.get_current_user(token=token, db=None))
+
+    assert len(lookups) == 2
@@ -2,6 +2,9 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from app.models.automation import AutomationFlow
+from app.models.site import Site
+
 
 def test_list_flows_empty(client: TestClient):
     """Test listing flows when database is empty."""
@@ -23,3 +26,23 @@ def test_trigger_flow_requires_auth(client: TestClient):
     """Test that triggering a flow requires authentication."""
     response = client.post("/api/flows/1/trigger")
     assert response.status_code == 401
+
+
+def test_list_flows_total_counts_all_rows(run, client: TestClient, session_factory):
+    """Test that total reports every flow, not just the returned page."""
+
+    async def seed() -> None:
+        async with session_factory() as session:
+            site = Site(name="Test Site", url="https://example.com")
+            session.add(site)
+            await session.flush()
+            session.add_all(
+                AutomationFlow(site_id=site.id, name=f"Flow {index}") for index in range(3)
+            )
+            await session.commit()
+
+    run(seed())
+
+    data = client.get("/api/flows", params={"limit": 2}).json()
+    assert len(data["items"]) == 2
+    assert data["total"] == 3
@@ -2,6 +2,10 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from app.models.automation import AutomationFlow
+from app.models.checkin import CheckinHistory
+from app.models.site import Site
+
 
 def test_list_history_empty(client: TestClient):
     """Test listing history when database is empty."""
@@ -23,3 +27,46 @@ def test_delete_history_requires_auth(client: TestClient):
     """Test that deleting history requires authentication."""
     response = client.delete("/api/history/1")
     assert response.status_code == 401
+
+
+def _seed_history(session_factory, run, error_types_per_row: list[list[str]]) -> None:
+    async def seed() -> None:
+        async with session_factory() as session:
+            site = Site(name="Test Site", url="https://example.com")
+            session.add(site)
+            await session.flush()
+            flow = AutomationFlow(site_id=site.id, name="Test Flow")
+            session.add(flow)
+            await session.flush()
+            for error_types in error_types_per_row:
+                session.add(CheckinHistory(flow_id=flow.id, error_types=error_types))
+            await session.commit()
+
+    run(seed())
+
+
+def test_list_history_filters_by_exact_error_type(run, client: TestClient, session_factory):
+    """Test that the error_type filter matches whole codes, not prefixes or substrings."""
+    _seed_history(
+        session_factory,
+        run,
+        [["TIMEOUT"], ["WAIT_TIMEOUT"], ["NAVIGATION_ERROR", "TIMEOUT"], []],
+    )
+
+    exact = client.get("/api/history", params={"error_type": "TIMEOUT"}).json()
+    assert exact["total"] == 2
+    assert all("TIMEOUT" in item["error_types"] for item in exact["items"])
+
+    for partial in ("TIME", "WAIT", "NAVIGATION"):
+        response = client.get("/api/history", params={"error_type": partial}).json()
+        assert response["total"] == 0
+        assert response["items"] == []
+
+
+def test_list_history_total_counts_all_rows(run, client: TestClient, session_factory):
+    """Test that total reports every matching row, not just the returned page."""
+    _seed_history(session_factory, run, [[], [], []])
+
+    data = client.get("/api/history", params={"limit": 2}).json()
+    assert len(data["items"]) == 2
+    assert data["total"] == 3
@@ -1,6 +1,10 @@
 """Tests for sites API endpoints."""
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import InvalidRequestError
+
+from app.crud import site as site_crud
+from app.models.site import Site, Tag
 
 
 def test_list_sites_empty(client: TestClient):
@@ -12,6 +16,23 @@ def test_list_sites_empty(client: TestClient):
     assert data["items"] == []
 
 
+def test_list_sites_total_counts_all_rows(run, client: TestClient, session_factory):
+    """Test that total reports every site, not just the returned page."""
+
+    async def seed() -> None:
+        async with session_factory() as session:
+            session.add_all(
+                Site(name=f"Site {index}", url="https://example.com") for index in range(3)
+            )
+            await session.commit()
+
+    run(seed())
+
+    data = client.get("/api/sites", params={"limit": 2}).json()
+    assert len(data["items"]) == 2
+    assert data["total"] == 3
+
+
 def test_create_site_requires_auth(client: TestClient):
     """Test that creating a site requires authentication."""
     response = client.post(
@@ -27,3 +48,64 @@ def test_healthcheck(client: TestClient):
     response = client.get("/healthz")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+def test_list_sites_raises_on_unloaded_relationships(run, session_factory):
+    """Test that list_sites loads no relationships and blocks lazy loads."""
+
+    async def check() -> None:
+        async with session_factory() as session:
+            session.add(Site(name="Test Site", url="https://example.com"))
+            await session.commit()
+
+        async with session_factory() as session:
+            (site,) = await site_crud.list_sites(session)
+            assert await site_crud.list_tag_ids(session, [site.id]) == {}
+            with pytest.raises(InvalidRequestError):
+                site.tags
+            with pytest.raises(InvalidRequestError):
+                site.auth_profile
+
+    run(check())
+
+
+def _auth_headers(client: TestClient) -> dict[str, str]:
+    client.post("/api/auth/bootstrap", json={"email": "admin@example.com", "password": "secret"})
+    response = client.post(
+        "/api/auth/token", data={"username": "admin@example.com", "password": "secret"}
+    )
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_create_site_without_tags(client: TestClient):
+    """Test creating a site with no tags."""
+    response = client.post(
+        "/api/sites",
+        json={"name": "Test Site", "url": "https://example.com"},
+        headers=_auth_headers(client),
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert data["name"] == "Test Site"
+    assert data["tags"] == []
+
+
+def test_create_site_with_tags(run, client: TestClient, session_factory):
+    """Test creating a site linked to existing tags."""
+
+    async def create_tag() -> int:
+        async with session_factory() as session:
+            tag = Tag(name="daily")
+            session.add(tag)
+            await session.commit()
+            return tag.id
+
+    tag_id = run(create_tag())
+    response = client.post(
+        "/api/sites",
+        json={"name": "Tagged Site", "url": "https://example.com", "tag_ids": [tag_id]},
+        headers=_auth_headers(client),
+    )
+    assert response.status_code == 201
+    assert [tag["id"] for tag in response.json()["tags"]] == [tag_id]
@@ -0,0 +1 @@
+# DB tests package
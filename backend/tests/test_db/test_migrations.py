@@ -0,0 +1,41 @@
+"""Tests for the startup column migrations in app.db.session."""
+import pytest
+from sqlalchemy import create_engine
+
+from app.db import session as db_session
+
+
+@pytest.fixture(name="legacy_engine")
+def legacy_engine_fixture(tmp_path, monkeypatch):
+    """An automation_flows table from before the flow option columns, with one row."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE automation_flows (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL)"
+        )
+        conn.exec_driver_sql("INSERT INTO automation_flows (id, name) VALUES (1, 'legacy')")
+    monkeypatch.setattr(db_session, "engine", engine)
+    yield engine
+    engine.dispose()
+
+
+def test_block_resources_backfills_existing_flows_as_off(legacy_engine):
+    """Test that flows created before the column keep loading every resource."""
+    db_session._ensure_flow_columns()
+
+    with legacy_engine.connect() as conn:
+        value = conn.exec_driver_sql(
+            "SELECT block_resources FROM automation_flows WHERE id = 1"
+        ).scalar_one()
+    assert value == 0
+
+
+def test_disable_animations_backfills_existing_flows_as_off(legacy_engine):
+    """Test that flows created before the column keep their page animations."""
+    db_session._ensure_flow_columns()
+
+    with legacy_engine.connect() as conn:
+        value = conn.exec_driver_sql(
+            "SELECT disable_animations FROM automation_flows WHERE id = 1"
+        ).scalar_one()
+    assert value == 0
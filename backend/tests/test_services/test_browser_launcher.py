@@ -0,0 +1,31 @@
+"""Tests for the CDP browser launcher's seed profile lookup."""
+from pathlib import Path
+
+import pytest
+
+from app.services.automation import browser_launcher
+
+
+@pytest.fixture(name="home")
+def home_fixture(tmp_path, monkeypatch) -> Path:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    return tmp_path
+
+
+def test_seed_profile_ignores_linux_and_macos_profiles(home: Path):
+    """Test that non-Windows profiles are never picked up for the first-run copy."""
+    (home / ".config" / "google-chrome").mkdir(parents=True)
+    (home / "Library" / "Application Support" / "Microsoft Edge").mkdir(parents=True)
+
+    assert browser_launcher.get_default_user_data_dir("chrome") is None
+    assert browser_launcher.get_default_user_data_dir("edge") is None
+
+
+def test_seed_profile_finds_windows_user_data(home: Path):
+    """Test that the Windows user data directory is used as the seed profile."""
+    user_data = home / "AppData" / "Local" / "Google" / "Chrome" / "User Data"
+    user_data.mkdir(parents=True)
+
+    assert browser_launcher.get_default_user_data_dir("chrome") == str(user_data)
+    assert browser_launcher.get_default_user_data_dir("firefox") is None
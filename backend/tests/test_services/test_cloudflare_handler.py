@@ -0,0 +1,82 @@
+"""Tests for the Cloudflare handler's check gating and challenge waits."""
+import asyncio
+import sys
+import types
+from unittest.mock import AsyncMock, MagicMock
+
+# Stub patchright before the handler import (shared with the other service tests)
+_async_api_stub = sys.modules.setdefault(
+    "patchright.async_api", types.ModuleType("patchright.async_api")
+)
+sys.modules.setdefault("patchright", types.ModuleType("patchright"))
+for _name in ("Page", "Response"):
+    if not hasattr(_async_api_stub, _name):
+        setattr(_async_api_stub, _name, MagicMock())
+if not hasattr(_async_api_stub, "TimeoutError"):
+    _async_api_stub.TimeoutError = TimeoutError
+
+from app.services.automation.cloudflare_handler import CloudflareHandler  # noqa: E402
+
+
+def _handler() -> CloudflareHandler:
+    handler = CloudflareHandler(safety_check_interval=30.0)
+    handler._detect_challenge_type = AsyncMock(return_value="none")
+    # The last document response was clean (no challenge status, not served by Cloudflare)
+    handler._last_response_suspect = False
+    return handler
+
+
+def test_clean_response_skips_dom_sweep_between_steps(run):
+    handler = _handler()
+    handler.mark_navigated()
+
+    assert run(handler.should_check())
+    result = run(handler.check_and_handle(MagicMock()))
+
+    assert result["detected"] is False
+    handler._detect_challenge_type.assert_not_awaited()
+
+
+def test_safety_interval_forces_dom_sweep_on_clean_page(run):
+    handler = _handler()
+    handler._last_check -= 31.0
+
+    assert run(handler.should_check())
+    run(handler.check_and_handle(MagicMock()))
+
+    handler._detect_challenge_type.assert_awaited_once()
+    assert not run(handler.should_check())
+
+
+def _page_with_wait(**wait_kwargs) -> MagicMock:
+    page = MagicMock()
+    page.wait_for_function = AsyncMock(**wait_kwargs)
+    return page
+
+
+def test_in_page_wait_polls_on_an_interval(run):
+    handle = MagicMock()
+    handle.json_value = AsyncMock(return_value="none")
+    page = _page_with_wait(return_value=handle)
+
+    assert run(_handler()._wait_until_settled(page, ["page"], 5000)) == "none"
+    # rAF polling stalls in background tabs, so the wait must use a fixed interval
+    assert page.wait_for_function.await_args.kwargs["polling"] == 250
+
+
+def test_failed_in_page_wait_falls_back_to_polling(run, monkeypatch):
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+    handler = _handler()
+    handler._detect_challenge_type = AsyncMock(side_effect=["page", "turnstile"])
+    page = _page_with_wait(side_effect=RuntimeError("Execution context was destroyed"))
+
+    assert run(handler._wait_until_settled(page, ["page"], 5000)) == "turnstile"
+    assert handler._detect_challenge_type.await_count == 2
+
+
+def test_failed_in_page_wait_is_not_reported_as_resolved(run):
+    handler = _handler()
+    handler._detect_challenge_type = AsyncMock(return_value="page")
+    page = _page_with_wait(side_effect=RuntimeError("Execution context was destroyed"))
+
+    assert run(handler._wait_until_settled(page, ["page"], 50)) is None
@@ -0,0 +1,26 @@
+"""Tests for the automation subprocess command line."""
+from app.models.automation import AutomationFlow
+from app.services.automation.executor import _build_command
+
+
+def _flow(**overrides) -> AutomationFlow:
+    return AutomationFlow(id=7, site_id=1, name="flow", dsl={"steps": []}, **overrides)
+
+
+def test_build_command_passes_page_load_options_by_default():
+    cmd = _build_command(_flow(), "exec-1")
+    assert cmd[2:4] == ["7", '{"steps": []}']
+    assert "--block-resources" in cmd
+    assert "--disable-animations" in cmd
+    assert "--persist-storage-state" not in cmd
+
+
+def test_build_command_omits_disabled_page_load_options():
+    cmd = _build_command(_flow(block_resources=False, disable_animations=False), "exec-1")
+    assert "--block-resources" not in cmd
+    assert "--disable-animations" not in cmd
+
+
+def test_build_command_passes_storage_state_opt_in():
+    cmd = _build_command(_flow(persist_storage_state=True), "exec-1")
+    assert "--persist-storage-state" in cmd
@@ -0,0 +1,43 @@
+"""Tests for PlaywrightExecutor step error handling."""
+import asyncio
+import sys
+import types
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Stub patchright before the executor import (shared with the other service tests)
+_async_api_stub = sys.modules.setdefault(
+    "patchright.async_api", types.ModuleType("patchright.async_api")
+)
+sys.modules.setdefault("patchright", types.ModuleType("patchright"))
+for _name in ("Browser", "Page", "Response", "Route", "async_playwright"):
+    if not hasattr(_async_api_stub, _name):
+        setattr(_async_api_stub, _name, MagicMock())
+if not hasattr(_async_api_stub, "TimeoutError"):
+    _async_api_stub.TimeoutError = TimeoutError
+
+from app.services.automation.dsl_parser import ParsedStep, StepType  # noqa: E402
+from app.services.automation.playwright_executor import PlaywrightExecutor  # noqa: E402
+
+
+def test_error_screenshot_is_awaited_when_error_detail_fails(run, tmp_path):
+    """Test that a failing _format_error_detail does not leave the screenshot task pending."""
+    executor = PlaywrightExecutor(
+        screenshot_dir=str(tmp_path / "shots"), storage_state_dir=str(tmp_path / "states")
+    )
+    executor._step_handlers[StepType.WAIT_TIME] = AsyncMock(side_effect=RuntimeError("step failed"))
+    executor._format_error_detail = AsyncMock(side_effect=RuntimeError("page gone"))
+    captured: list[str] = []
+
+    async def screenshot(path: str, full_page: bool) -> None:
+        await asyncio.sleep(0.01)
+        captured.append(path)
+
+    page = MagicMock()
+    page.screenshot = screenshot
+
+    with pytest.raises(RuntimeError, match="page gone"):
+        run(executor._execute_step(page, ParsedStep(StepType.WAIT_TIME, {"duration": 1}), 0, {}, 1))
+
+    assert len(captured) == 1
@@ -16,3 +16,8 @@ def test_extract_json_payload_last_line_json():
 def test_extract_json_payload_from_last_brace_block():
     output = "INFO something {not-json}\nmore logs\n{\"status\": \"success\", \"data\": {\"a\": 1}}"
     assert extract_json_payload(output) == {"status": "success", "data": {"a": 1}}
+
+
+def test_extract_json_payload_without_json_returns_none():
+    assert extract_json_payload("Traceback (most recent call last):\n  boom {x}\nError") is None
+    assert extract_json_payload("[1, 2, 3]") is None
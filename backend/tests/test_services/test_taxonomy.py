@@ -0,0 +1,53 @@
+"""Tests for the process-local category/tag cache."""
+from types import SimpleNamespace
+
+from cachetools import TTLCache
+import pytest
+
+from app.services import taxonomy
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch) -> None:
+    monkeypatch.setattr(taxonomy, "_cache", TTLCache(maxsize=2, ttl=60))
+
+
+def test_tags_are_cached_between_reads(run, monkeypatch):
+    """Test that a second read is served without querying the tags table."""
+    queries: list[int] = []
+
+    async def list_tags(_session):
+        queries.append(1)
+        return [SimpleNamespace(id=1, name="daily", color=None)]
+
+    monkeypatch.setattr(taxonomy.catalog_crud, "list_tags", list_tags)
+
+    first = run(taxonomy.get_tags(None))
+    second = run(taxonomy.get_tags(None))
+
+    assert second is first
+    assert len(queries) == 1
+
+
+def test_fill_overlapping_invalidate_is_not_cached(run, monkeypatch):
+    """Test that a read racing a write does not cache the pre-write result."""
+    rows = [SimpleNamespace(id=1, name="daily", color=None)]
+
+    async def list_tags(_session):
+        snapshot = list(rows)
+        # A tag write commits and invalidates while this read is still in flight
+        rows.append(SimpleNamespace(id=2, name="weekly", color=None))
+        taxonomy.invalidate()
+        return snapshot
+
+    monkeypatch.setattr(taxonomy.catalog_crud, "list_tags", list_tags)
+
+    stale = run(taxonomy.get_tags(None))
+    assert list(stale) == [1]
+    assert "tags" not in taxonomy._cache
+
+    async def list_tags_after_write(_session):
+        return list(rows)
+
+    monkeypatch.setattr(taxonomy.catalog_crud, "list_tags", list_tags_after_write)
+    assert list(run(taxonomy.get_tags(None))) == [1, 2]
@@ -19,6 +19,12 @@ def test_resolve_variables_supports_dollar_braces():
     assert resolve_variables("${n} items", variables) == "3 items"
 
 
+def test_resolve_variables_leaves_unknown_placeholders_untouched():
+    variables = {"name": "alice"}
+    assert resolve_variables("{{name}} ${other} {{missing}}", variables) == "alice ${other} {{missing}}"
+    assert resolve_variables("`${name}`", {}) == "`${name}`"
+
+
 def test_resolve_variables_non_str_passthrough_by_default():
     variables = {"x": "y"}
     assert resolve_variables(123, variables) == 123
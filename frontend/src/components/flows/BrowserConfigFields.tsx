@@ -119,6 +119,35 @@ const BrowserConfigFields = ({ form }: BrowserConfigFieldsProps) => {
         }
       </Form.Item>
 
+      <Divider style={{ borderColor: "#e4e4e7" }}>页面加载优化</Divider>
+
+      <Form.Item
+        name="block_resources"
+        label="拦截图片/字体/媒体与统计请求"
+        valuePropName="checked"
+        tooltip="加快页面加载；仅在非CDP模式下生效。依赖图片验证码或需要完整截图的流程请关闭"
+      >
+        <Switch />
+      </Form.Item>
+
+      <Form.Item
+        name="disable_animations"
+        label="禁用CSS动画与过渡"
+        valuePropName="checked"
+        tooltip="点击/等待无需等待动画结束；仅在非CDP模式下生效"
+      >
+        <Switch />
+      </Form.Item>
+
+      <Form.Item
+        name="persist_storage_state"
+        label="保留登录状态"
+        valuePropName="checked"
+        tooltip="成功运行后保存 Cookie/localStorage，下次运行时恢复以免重复登录；仅在非CDP模式下生效"
+      >
+        <Switch />
+      </Form.Item>
+
       <Divider style={{ borderColor: "#e4e4e7" }}>代理设置</Divider>
 
       <Form.Item
@@ -220,6 +220,9 @@ const FlowFormModal = ({
           browser_type: "chromium",
           use_cdp_mode: false,
           cdp_port: 9222,
+          block_resources: true,
+          disable_animations: true,
+          persist_storage_state: false,
         }}
         style={{ marginTop: 24 }}
       >
@@ -172,6 +172,9 @@ const FlowsPage = () => {
       use_cdp_mode: flow.use_cdp_mode,
       cdp_port: flow.cdp_port,
       cdp_user_data_dir: flow.cdp_user_data_dir,
+      block_resources: flow.block_resources ?? true,
+      disable_animations: flow.disable_animations ?? true,
+      persist_storage_state: flow.persist_storage_state ?? false,
       use_proxy: flow.use_proxy ?? false,
       proxy_id: flow.proxy_id ?? null,
       _proxy_mode: flow.proxy_id ? "specific" : "auto",
@@ -192,6 +195,9 @@ const FlowsPage = () => {
       use_cdp_mode: false,
       cdp_port: 9222,
       cdp_user_data_dir: undefined,
+      block_resources: true,
+      disable_animations: true,
+      persist_storage_state: false,
       use_proxy: false,
       proxy_id: null,
       _proxy_mode: "auto",
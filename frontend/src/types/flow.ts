@@ -16,6 +16,9 @@ export interface AutomationFlow {
   use_cdp_mode: boolean;
   cdp_port: number;
   cdp_user_data_dir?: string | null;
+  block_resources: boolean;
+  disable_animations: boolean;
+  persist_storage_state: boolean;
   use_proxy: boolean;
   proxy_id?: number | null;
   dsl: FlowDSL;